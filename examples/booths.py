@@ -0,0 +1,55 @@
+"""Preload and booth functions to run the SpotDialogService of several booths with the BoothSupervisor.
+
+Each booth runs a DialogManager with the stub disambiguator of ``explore_states.py`` on an in-memory event bus, bound
+to the topic namespace of the booth, and keeps a checkpoint per booth. After a crash the booth restores the game from
+its checkpoint and resumes the dialog.
+
+Run from the examples directory:
+``python -m spot_service.dialog.supervisor --preload booths:preload --run booths:run_booth --checkpoints checkpoints
+booth1 booth2``
+"""
+import logging
+import os
+import threading
+
+from cltl.combot.infra.event.memory import SynchronousEventBus
+from cltl.combot.infra.resource.threaded import ThreadedResourceManager
+
+from explore_states import StubDisambiguator, PHRASES, PREFERENCES
+from load_test import FakeEmissorDataClient, MIC_TOPIC, TEXT_IN_TOPIC, GAME_IN_TOPIC, GAME_STATE_TOPIC, \
+    TEXT_OUT_TOPIC, ANNOTATION_TOPIC, DESIRE_TOPIC
+from spot.dialog.dialog_manager import DialogManager
+from spot_service.dialog.service import SpotDialogService
+
+logger = logging.getLogger(__name__)
+
+
+STORAGE_PATH = "storage"
+POSITIONS = 3
+
+
+def preload():
+    # Loaded once in the supervisor and shared with the booths, e.g. the phrases and the disambiguation world
+    return {"phrases": PHRASES, "preferences": PREFERENCES}
+
+
+def run_booth(booth, shared, checkpoint_path, recover):
+    storage_path = os.path.join(STORAGE_PATH, booth)
+    manager = DialogManager(StubDisambiguator(), shared["phrases"], shared["preferences"], 1, storage_path,
+                            rounds=2, max_position=POSITIONS, questionnaires=[1], disambiguator_positions=POSITIONS,
+                            checkpoint_path=checkpoint_path)
+    restored = recover and manager.restore()
+
+    topics = [f"{booth}.{topic}" for topic in (MIC_TOPIC, TEXT_IN_TOPIC, GAME_IN_TOPIC, GAME_STATE_TOPIC,
+                                                 TEXT_OUT_TOPIC, ANNOTATION_TOPIC)]
+    service = SpotDialogService(*topics, None, f"{booth}.{DESIRE_TOPIC}", [], 1.0, manager, FakeEmissorDataClient(),
+                                SynchronousEventBus(), ThreadedResourceManager())
+    if restored:
+        service.resume()
+    service.start()
+    logger.info("Started booth %s (restored: %s)", booth, restored)
+
+    try:
+        threading.Event().wait()
+    finally:
+        service.stop()
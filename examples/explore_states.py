@@ -0,0 +1,280 @@
+"""Exhaustive exploration of the DialogManager state space.
+
+Drives a DialogManager with a stub disambiguator that can report every DisambiguatorStatus, with and without
+continuation, and with all combinations of game events, utterances and commits. All reachable
+(ConvState, confirmation, attempt_counter, position, round, ...) states are explored breadth first up to a bound,
+each level is expanded in parallel on all cores.
+
+The report lists conversational states and transitions of ConvState that were never reached, inputs that raised an
+error, runs that did not await input within a bounded number of steps and states from which the game cannot finish.
+
+Run from the repository root: ``python examples/explore_states.py [--rounds 2] [--positions 2] [--max-states 50000]``
+
+A bounded exploration (one round, two positions) is part of the tests in ``tests/test_state_space.py``.
+"""
+import argparse
+import collections
+import logging
+import os
+import pickle
+import random
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src"))
+
+from spot.dialog.dialog_manager import DialogManager, ConvState
+from spot.dialog.status import DisambiguatorStatus
+
+
+MAX_STEPS = 100
+
+UTTERANCES = ["ja", "nee", "Ok", "de man met de hoed"]
+
+PHRASES = {
+    "1": {
+        "start": ["Hallo {name}", "Zullen we beginnen?"],
+        "intro": ["Dit is het spel", "Klaar?"],
+        "outro": [["Wat vond je het leukst?", True], ["Tot ziens", False]],
+    },
+    "START_ROUND_1_PHRASES": "Eerste ronde",
+    "START_ROUND_PHRASES": ["Volgende ronde", "Nog een ronde"],
+    "QUERY_NEXT_POS_1_PHRASES": "Wie staat er op 1?",
+    "QUERY_NEXT_PHRASES": "Wie staat er op {position}?",
+    "QUERY_NEXT_REPAIR_PHRASES": "Wie staat er nu op {position}?",
+    "NO_MATCH_PHRASES": "Ik weet niet wie je bedoelt",
+    "REPAIR_NEG_RESPONSE_PHRASES": "Wie dan wel?",
+    "MATCH_PREVIOUS_PHRASES": "Die hadden we al",
+    "SKIP_CHARACTER_PHRASES": "We slaan deze over",
+    "ACKNOWLEDGE_NEE_PHRASES": "Jammer",
+    "ACKNOWLEDGE_FAILED_PHRASES": "Ja of nee?",
+    "ACKNOWLEDGE_SAME_POSITION_PHRASES": "Op {position} staat %s",
+    "ACKNOWLEDGE_DIFFERENT_POSITION_PHRASES": "Op {position} stond %s",
+    "ACKNOWLEDGE_HINT_ROUND_1_PHRASES": "Goed zo",
+    "ENCOURAGEMENT_PHRASES": "Ga zo door",
+    "ROUND_FINISH_PHRASES": "Klaar",
+    "FINISH_ROUND_1_PHRASES": "Klaar {name}",
+    "FINISH_ROUND_PHRASES": "Weer klaar {name}",
+    "FINISH_GAME_PHRASES": "Einde",
+}
+
+PREFERENCES = {"1": ["rood", "blauw"]}
+
+
+class GameStart:
+    participant_id = "explorer"
+    participant_name = "Explorer"
+
+
+class StuckLoop(Exception):
+    pass
+
+
+class StubDisambiguator:
+    """Disambiguator that returns the status planned by the explorer."""
+    def __init__(self):
+        self._status = DisambiguatorStatus.AWAIT_NEXT.name
+        self._uncommitted = None
+        self.plan = (DisambiguatorStatus.NO_MATCH.name, False)
+
+    def status(self, uncommitted=False):
+        return self._uncommitted if uncommitted and self._uncommitted else self._status
+
+    def commit_status(self):
+        if self._uncommitted:
+            self._status = self._uncommitted
+        self._uncommitted = None
+
+    def disambiguate(self, mention, force_commit=False):
+        status, continuation = self.plan
+        if continuation:
+            self._uncommitted = status
+        else:
+            self._status = status
+            self._uncommitted = None
+        certainty = 0.9 if status == DisambiguatorStatus.SUCCESS_HIGH.name else 0.4
+
+        return "character", certainty, 1, "die met de hoed", continuation
+
+    def advance_round(self, round_number=None, start=False):
+        self._status = DisambiguatorStatus.AWAIT_NEXT.name
+        self._uncommitted = None
+
+    def advance_position(self, skip=False):
+        self._status = DisambiguatorStatus.AWAIT_NEXT.name
+        self._uncommitted = None
+
+    def save_interaction(self, storage_path, participant_id, session):
+        pass
+
+    def load_interaction(self, storage_path, participant_id, session):
+        pass
+
+
+class ExploredDialogManager(DialogManager):
+    """DialogManager that fails on runs that do not await input within a bounded number of steps."""
+    def run(self, utterance, game_transition):
+        self._steps = 0
+        self.transitions = set()
+        return super().run(utterance, game_transition)
+
+    def act(self, utterance, game_transition, state):
+        self._steps += 1
+        if self._steps > MAX_STEPS:
+            raise StuckLoop(f"No input awaited after {MAX_STEPS} steps in {state.conv_state}")
+
+        result = super().act(utterance, game_transition, state)
+        self.transitions.add((state.conv_state.name, result[1].conv_state.name))
+
+        return result
+
+
+def inputs():
+    yield ("game",)
+    yield ("commit",)
+    for utterance in UTTERANCES:
+        for status in DisambiguatorStatus:
+            for continuation in (False, True):
+                yield "utterance", utterance, status.name, continuation
+
+
+def state_key(manager: DialogManager):
+    state = manager._state
+    uncommitted = manager._uncommitted_state
+
+    return (state.conv_state.name,
+            state.confirmation.name if state.confirmation else None,
+            state.attempt_counter,
+            state.position,
+            state.round,
+            state.game_start.step if state.game_start else None,
+            state.intro.step if state.intro else None,
+            state.outro.step if state.outro else None,
+            state.utterance is not None,
+            state.disambiguation_result.status.name if state.disambiguation_result else None,
+            uncommitted.conv_state.name if uncommitted else None,
+            manager._disambiguator.status())
+
+
+def apply(task):
+    """Apply an input to a pickled manager, returns the resulting manager and key or the error."""
+    data, step = task
+    random.seed(0)
+    manager = pickle.loads(data)
+    try:
+        if step[0] == "game":
+            manager.game_event(GameStart())
+        elif step[0] == "commit":
+            if not manager._uncommitted_state:
+                return None
+            manager.commit()
+        else:
+            _, utterance, status, continuation = step
+            manager._disambiguator.plan = (status, continuation)
+            manager.utterance(utterance)
+    except StuckLoop as e:
+        return "stuck", str(e)
+    except Exception as e:
+        return "error", f"{type(e).__name__}: {e}"
+
+    return "ok", pickle.dumps(manager), state_key(manager), manager.transitions
+
+
+def explore(rounds, positions, max_states, workers):
+    manager = ExploredDialogManager(StubDisambiguator(), PHRASES, PREFERENCES, 1, None,
+                                    rounds=rounds, max_position=positions, questionnaires=[1],
+                                    disambiguator_positions=positions)
+    start_key = state_key(manager)
+    frontier = {start_key: pickle.dumps(manager)}
+    seen = {start_key}
+    edges = collections.defaultdict(set)
+    transitions = set()
+    errors = collections.defaultdict(list)
+    stuck = collections.defaultdict(list)
+    truncated = False
+
+    steps = list(inputs())
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        while frontier:
+            tasks = [(key, (data, step)) for key, data in frontier.items() for step in steps]
+            frontier = {}
+            results = executor.map(apply, [task for _, task in tasks], chunksize=64)
+            for (key, (_, step)), result in zip(tasks, results):
+                if result is None:
+                    continue
+                if result[0] == "error":
+                    errors[result[1]].append((key, step))
+                    continue
+                if result[0] == "stuck":
+                    stuck[result[1]].append((key, step))
+                    continue
+
+                _, data, next_key, step_transitions = result
+                edges[key].add(next_key)
+                transitions.update(step_transitions)
+                if next_key not in seen:
+                    if len(seen) >= max_states:
+                        truncated = True
+                        continue
+                    seen.add(next_key)
+                    frontier[next_key] = data
+
+    return seen, edges, transitions, errors, stuck, truncated
+
+
+def cannot_finish(seen, edges):
+    finished = {key for key in seen if key[0] == ConvState.GAME_FINISH.name}
+    reverse = collections.defaultdict(set)
+    for source, targets in edges.items():
+        for target in targets:
+            reverse[target].add(source)
+
+    reachable = set(finished)
+    todo = list(finished)
+    while todo:
+        for source in reverse[todo.pop()]:
+            if source not in reachable:
+                reachable.add(source)
+                todo.append(source)
+
+    return seen - reachable
+
+
+def report(seen, edges, transitions, errors, stuck, truncated):
+    print(f"Explored {len(seen)} states{' (truncated)' if truncated else ''}")
+
+    reached = {state for transition in transitions for state in transition}
+    unreached = [state.name for state in ConvState if state.name not in reached]
+    print(f"Unreached conversational states: {', '.join(unreached) if unreached else '-'}")
+
+    allowed = {(source.name, target.name) for source in ConvState for target in source.transitions()}
+    unused = sorted(allowed - transitions)
+    print(f"Unused transitions ({len(unused)}/{len(allowed)}):")
+    for source, target in unused:
+        print(f"    {source} -> {target}")
+
+    for title, failures in (("Errors", errors), ("Stuck loops", stuck)):
+        print(f"{title}: {sum(len(occurrences) for occurrences in failures.values())}")
+        for message, occurrences in failures.items():
+            key, step = occurrences[0]
+            print(f"    {message} ({len(occurrences)}x), e.g. input {step} in state {key}")
+
+    dead = cannot_finish(seen, edges) if not truncated else set()
+    print(f"States that cannot reach GAME_FINISH: {len(dead)}")
+    for key in sorted(dead, key=str)[:10]:
+        print(f"    {key}")
+
+    return not errors and not stuck and not dead
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Explore the state space of the DialogManager")
+    parser.add_argument("--rounds", type=int, default=2, help="Number of game rounds")
+    parser.add_argument("--positions", type=int, default=2, help="Number of positions per round")
+    parser.add_argument("--max-states", type=int, default=50000, help="Bound on the number of explored states")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="Number of worker processes")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.ERROR)
+    result = explore(args.rounds, args.positions, args.max_states, args.workers)
+    sys.exit(0 if report(*result) else 1)
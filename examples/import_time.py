@@ -0,0 +1,62 @@
+"""Check the cold import time of the dialog modules against a budget.
+
+Each module is imported in a fresh interpreter with ``python -X importtime``. The script fails if the cumulative
+import time of a module exceeds its budget, or if a core module pulls in one of the heavy dependencies.
+
+Run from the repository root: ``python examples/import_time.py [--repeat N]``
+"""
+import argparse
+import os
+import subprocess
+import sys
+
+# Module: (budget in ms, modules that must not be imported)
+BUDGETS = {
+    "spot.dialog.status": (50, ["spot.pragmatic_model", "cltl", "emissor"]),
+    "spot.dialog.dialog_manager": (100, ["spot.pragmatic_model", "cltl", "emissor"]),
+    "spot.dialog.export": (100, ["spot.pragmatic_model", "cltl", "emissor"]),
+    "spot_service.dialog.service": (100, ["spot.pragmatic_model", "cltl", "cltl_service", "emissor"]),
+}
+
+
+def import_time(module: str):
+    src = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "src")
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [src, os.environ.get("PYTHONPATH")])))
+    result = subprocess.run([sys.executable, "-X", "importtime", "-c", f"import {module}"],
+                            env=env, stderr=subprocess.PIPE, universal_newlines=True)
+    if result.returncode:
+        raise ImportError(f"Failed to import {module}:\n{result.stderr}")
+
+    imported = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        imported[name.strip()] = int(cumulative) / 1000
+
+    return imported[module], imported
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Check import times of the dialog modules")
+    parser.add_argument("--repeat", type=int, default=3, help="Number of cold imports per module, the minimum is used")
+    args = parser.parse_args()
+
+    failed = False
+    for module, (budget, forbidden) in BUDGETS.items():
+        try:
+            timings = [import_time(module) for _ in range(args.repeat)]
+        except ImportError as e:
+            print(f"SKIP {module}: {str(e).splitlines()[-1]}")
+            continue
+
+        duration = min(timing for timing, _ in timings)
+        imported = timings[0][1]
+        heavy = sorted(name for name in imported if any(name == f or name.startswith(f + ".") for f in forbidden))
+
+        ok = duration <= budget and not heavy
+        failed = failed or not ok
+        print(f"{'OK  ' if ok else 'FAIL'} {module}: {duration:.1f}ms (budget {budget}ms)"
+              + (f", imports {', '.join(heavy)}" if heavy else ""))
+
+    sys.exit(1 if failed else 0)
@@ -0,0 +1,279 @@
+"""Load generator and soak test for the SpotDialogService.
+
+Runs the service on an in-memory event bus with a fake emissor data client and a stub disambiguator
+(see ``explore_states.py``). Simulated players react to the game state published by the service: they submit game
+events when the game is awaited and answer in one or more ASR fragments, separated by gaps that are either shorter or
+longer than the gap timeout, preceded by a mic start event. On top of that, noise fragments are injected at a fixed
+rate. Finished games continue with the next participant from a DialogManagerPool.
+
+Reply latency is measured from the first input that was not answered yet to the next game state published by the
+service; inputs that are answered together (coalesced, cached or ignored) are counted as unanswered. Percentiles are
+computed from a fixed size reservoir sample of the latencies, and memory growth is measured for allocations in the
+``spot`` and ``spot_service`` packages only, such that the load generator itself does not add to it.
+
+Run from the repository root: ``python examples/load_test.py --duration 3600``
+"""
+import argparse
+import dataclasses
+import heapq
+import itertools
+import logging
+import queue
+import random
+import threading
+import time
+import tracemalloc
+
+from cltl.combot.event.emissor import TextSignalEvent, AudioSignalStarted, SignalEvent
+from cltl.combot.infra.event import Event
+from cltl.combot.infra.event.memory import SynchronousEventBus
+from cltl.combot.infra.resource.threaded import ThreadedResourceManager
+from cltl.combot.infra.time_util import timestamp_now
+from emissor.representation.scenario import TextSignal, Modality, class_type
+
+from explore_states import StubDisambiguator, PHRASES, PREFERENCES
+from spot.dialog.dialog_manager import DialogManager
+from spot.dialog.pool import DialogManagerPool
+from spot.dialog.status import DisambiguatorStatus
+from spot_service.dialog.api import GameSignal, GameEvent
+from spot_service.dialog.service import SpotDialogService
+
+logger = logging.getLogger(__name__)
+
+
+SCENARIO_ID = "load-test"
+
+RESERVOIR_SIZE = 10000
+SERVICE_FILES = [tracemalloc.Filter(True, "*/spot/*"), tracemalloc.Filter(True, "*/spot_service/*")]
+
+MIC_TOPIC = "cltl.topic.mic"
+TEXT_IN_TOPIC = "cltl.topic.text_in"
+GAME_IN_TOPIC = "cltl.topic.game_input"
+GAME_STATE_TOPIC = "cltl.topic.game_state"
+TEXT_OUT_TOPIC = "cltl.topic.text_out"
+ANNOTATION_TOPIC = "cltl.topic.annotation"
+DESIRE_TOPIC = "cltl.topic.desire"
+
+
+class FakeEmissorDataClient:
+    def get_current_scenario_id(self):
+        return SCENARIO_ID
+
+
+class RandomDisambiguator(StubDisambiguator):
+    def __init__(self, continuation_chance):
+        super().__init__()
+        self._continuation_chance = continuation_chance
+
+    def disambiguate(self, mention, force_commit=False):
+        self.plan = (random.choice(list(DisambiguatorStatus)).name, random.random() < self._continuation_chance)
+
+        return super().disambiguate(mention, force_commit)
+
+    def reset(self):
+        self.advance_round(start=True)
+
+
+@dataclasses.dataclass
+class MicStarted:
+    # The service only checks the payload type of mic events
+    type: str = AudioSignalStarted.__name__
+
+
+class Statistics:
+    def __init__(self, seed=None):
+        self.lock = threading.Lock()
+        self.latencies = []
+        self.measured = 0
+        self.pending = []
+        self.injected = 0
+        self.replies = 0
+        self.unanswered = 0
+        self.games = 0
+        self._random = random.Random(seed)
+
+    def injected_input(self):
+        with self.lock:
+            self.injected += 1
+            self.pending.append(time.monotonic())
+
+    def received_reply(self):
+        with self.lock:
+            self.replies += 1
+            if self.pending:
+                self._sample(time.monotonic() - self.pending[0])
+                self.unanswered += len(self.pending) - 1
+                self.pending = []
+
+    def _sample(self, latency):
+        # Reservoir sampling keeps a uniform sample of all latencies in bounded memory
+        self.measured += 1
+        if len(self.latencies) < RESERVOIR_SIZE:
+            self.latencies.append(latency)
+        else:
+            index = self._random.randrange(self.measured)
+            if index < RESERVOIR_SIZE:
+                self.latencies[index] = latency
+
+    def percentiles(self, *percentiles):
+        with self.lock:
+            latencies = sorted(self.latencies)
+        if not latencies:
+            return [None for _ in percentiles]
+
+        return [latencies[min(len(latencies) - 1, int(len(latencies) * p / 100))] for p in percentiles]
+
+
+class LoadGenerator:
+    def __init__(self, service: SpotDialogService, event_bus, args):
+        self._service = service
+        self._event_bus = event_bus
+        self._args = args
+
+        self._schedule = []
+        self._sequence = itertools.count()
+        self._states = queue.Queue()
+        self._participant = 0
+        self.statistics = Statistics(args.seed)
+
+        event_bus.subscribe(GAME_STATE_TOPIC, self._on_game_state)
+
+    def run(self, duration):
+        tracemalloc.start()
+        start = time.monotonic()
+        baseline = self._service_memory()
+        next_report = start + self._args.report
+        self._at(start, self._game_event)
+        if self._args.noise_rate:
+            self._at(start + random.expovariate(self._args.noise_rate), self._noise)
+
+        while time.monotonic() - start < duration:
+            self._react()
+            if self._schedule and self._schedule[0][0] <= time.monotonic():
+                _, _, action = heapq.heappop(self._schedule)
+                action()
+            else:
+                time.sleep(0.001)
+
+            if time.monotonic() >= next_report:
+                self.report(time.monotonic() - start, baseline)
+                next_report += self._args.report
+
+        self.report(time.monotonic() - start, baseline)
+        tracemalloc.stop()
+
+    def report(self, elapsed, baseline):
+        current = self._service_memory()
+        p50, p95, p99 = self.statistics.percentiles(50, 95, 99)
+        metrics = self._service.metrics
+        print(f"[{elapsed:8.0f}s] games {self.statistics.games}, injected {self.statistics.injected}, "
+              f"replies {self.statistics.replies}, unanswered {self.statistics.unanswered}, "
+              f"latency p50/p95/p99 {self._ms(p50)}/{self._ms(p95)}/{self._ms(p99)}, "
+              f"dropped {metrics['lanes_dropped']}, expired {metrics['lanes_expired']}, "
+              f"superseded {metrics['lanes_superseded']}, max wait {self._ms(metrics['lanes_max_wait'])}, "
+              f"cache max depth {metrics['cache_max_depth']}, cache dropped {metrics['cache_dropped']}, "
+              f"annotations dropped {metrics['annotations_dropped']}, "
+              f"service memory {(current - baseline) / 1024:+.0f}KiB", flush=True)
+
+    @staticmethod
+    def _service_memory():
+        snapshot = tracemalloc.take_snapshot().filter_traces(SERVICE_FILES)
+
+        return sum(stat.size for stat in snapshot.statistics("filename"))
+
+    def _on_game_state(self, event):
+        self.statistics.received_reply()
+        self._states.put(event.payload.signal.value)
+
+    def _react(self):
+        try:
+            game_event = self._states.get_nowait()
+        except queue.Empty:
+            return
+
+        now = time.monotonic()
+        if game_event.state == "GAME_FINISH":
+            self.statistics.games += 1
+            self._at(now + self._delay(self._args.think), self._game_event)
+        elif game_event.input == "GAME":
+            self._at(now + self._delay(self._args.think), self._game_event)
+        elif game_event.input == "REPLY":
+            self._at(now + self._delay(self._args.think), self._utterance)
+
+    def _utterance(self):
+        self._publish_mic()
+        fragments = random.randint(1, self._args.fragments)
+        at = time.monotonic()
+        for fragment in range(fragments):
+            text = random.choice(["ja", "nee", "Ok", "de man met de hoed", "rood", "die met de bril"])
+            self._at(at, lambda text=text: self._publish_text(text))
+            # Gaps are either within or beyond the gap timeout
+            at += self._delay(self._args.gap_timeout * random.choice([0.5, 1.5]))
+
+    def _noise(self):
+        self._publish_text(random.choice(["eh", "hmm", "ja", "nou"]))
+        self._at(time.monotonic() + random.expovariate(self._args.noise_rate), self._noise)
+
+    def _game_event(self):
+        self._participant += 1
+        game_event = GameEvent(participant_id=f"load-{self._participant}", participant_name="Load")
+        signal = GameSignal.for_scenario(SCENARIO_ID, timestamp_now(), game_event)
+        self.statistics.injected_input()
+        self._event_bus.publish(GAME_IN_TOPIC, Event.for_payload(SignalEvent(class_type(GameSignal), Modality.VIDEO, signal)))
+
+    def _publish_text(self, text):
+        signal = TextSignal.for_scenario(SCENARIO_ID, timestamp_now(), timestamp_now(), None, text)
+        self.statistics.injected_input()
+        self._event_bus.publish(TEXT_IN_TOPIC, Event.for_payload(TextSignalEvent.for_speaker(signal)))
+
+    def _publish_mic(self):
+        self._event_bus.publish(MIC_TOPIC, Event.for_payload(MicStarted()))
+
+    def _at(self, at, action):
+        heapq.heappush(self._schedule, (at, next(self._sequence), action))
+
+    @staticmethod
+    def _delay(mean_ms):
+        return random.expovariate(1000 / mean_ms) if mean_ms else 0
+
+    @staticmethod
+    def _ms(seconds):
+        return f"{seconds * 1000:.0f}ms" if seconds is not None else "-"
+
+
+def create_manager(continuation_chance):
+    return DialogManager(RandomDisambiguator(continuation_chance), PHRASES, PREFERENCES, 1, None,
+                         rounds=2, max_position=3, questionnaires=[1], disambiguator_positions=3)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Load and soak test of the SpotDialogService")
+    parser.add_argument("--duration", type=float, default=60, help="Duration of the test in seconds")
+    parser.add_argument("--report", type=float, default=60, help="Report interval in seconds")
+    parser.add_argument("--gap-timeout", type=float, default=1000, help="Gap timeout of the service in ms")
+    parser.add_argument("--max-input-age", type=float, default=None, help="Maximum input age of the service in ms")
+    parser.add_argument("--think", type=float, default=500, help="Mean reaction time of the player in ms")
+    parser.add_argument("--fragments", type=int, default=3, help="Maximum number of ASR fragments per utterance")
+    parser.add_argument("--noise-rate", type=float, default=0.2, help="Noise fragments per second")
+    parser.add_argument("--continuation", type=float, default=0.3,
+                        help="Chance that the disambiguator awaits a continuation")
+    parser.add_argument("--seed", type=int, default=None, help="Random seed")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.WARNING)
+    random.seed(args.seed)
+
+    event_bus = SynchronousEventBus()
+    resource_manager = ThreadedResourceManager()
+    pool = DialogManagerPool(lambda: create_manager(args.continuation), size=1).start()
+
+    service = SpotDialogService(MIC_TOPIC, TEXT_IN_TOPIC, GAME_IN_TOPIC, GAME_STATE_TOPIC, TEXT_OUT_TOPIC,
+                                ANNOTATION_TOPIC, None, DESIRE_TOPIC, [], args.gap_timeout / 1000,
+                                create_manager(args.continuation), FakeEmissorDataClient(), event_bus, resource_manager,
+                                max_input_age=args.max_input_age / 1000 if args.max_input_age else None, pool=pool)
+    service.start()
+    try:
+        LoadGenerator(service, event_bus, args).run(args.duration)
+    finally:
+        service.stop()
+        pool.stop()
@@ -0,0 +1,130 @@
+import math
+from array import array
+from typing import Optional, Iterable, Tuple
+
+ATTEMPT = "ATTEMPT"
+REPAIR = "REPAIR"
+SKIP = "SKIP"
+
+
+class RoundStatistics:
+    """Incremental per round and position statistics of a game.
+
+    Counters are kept in a flat array indexed by (round, position, column), where the columns are the number of
+    disambiguation attempts, repairs and skips, followed by the count of each disambiguator status. Repairs are
+    additionally counted per status in a ``REPAIR_<status>`` column that is added on first use. Certainty values
+    are aggregated as running count, mean and sum of squared differences (Welford) per (round, position).
+    """
+    def __init__(self, rounds: int, max_position: int, statuses: Iterable[str]):
+        self._rounds = rounds + 1
+        self._positions = max_position + 1
+        self._columns = [ATTEMPT, REPAIR, SKIP] + list(statuses)
+        self._column_index = {column: idx for idx, column in enumerate(self._columns)}
+
+        self._counts = array('I', bytes(array('I').itemsize * self._rounds * self._positions * len(self._columns)))
+        self._certainty = array('d', bytes(array('d').itemsize * self._rounds * self._positions * 3))
+        self._results = []
+
+    @property
+    def columns(self):
+        return tuple(self._columns)
+
+    def record_disambiguation(self, round: int, position: int, attempt: int, selected, certainty: Optional[float],
+                              status: str):
+        self._increment(round, position, ATTEMPT)
+        self._increment(round, position, status)
+
+        if certainty is not None:
+            certainty = float(certainty)
+            offset = self._offset(round, position) * 3
+            count = self._certainty[offset] + 1
+            delta = certainty - self._certainty[offset + 1]
+            mean = self._certainty[offset + 1] + delta / count
+            self._certainty[offset] = count
+            self._certainty[offset + 1] = mean
+            self._certainty[offset + 2] += delta * (certainty - mean)
+
+        self._results.append({"round": round, "position": position, "attempt": attempt,
+                              "selected": selected, "certainty": certainty, "status": status})
+
+    def record_repair(self, round: int, position: int, status: str):
+        self._increment(round, position, REPAIR)
+        self._increment(round, position, f"{REPAIR}_{status}")
+
+    def record_skip(self, round: int, position: int):
+        self._increment(round, position, SKIP)
+
+    def count(self, column: str, round: Optional[int] = None, position: Optional[int] = None) -> int:
+        if column not in self._column_index:
+            return 0
+
+        rounds = range(self._rounds) if round is None else [round]
+        positions = range(self._positions) if position is None else [position]
+
+        return sum(self._counts[self._offset(r, p) * len(self._columns) + self._column_index[column]]
+                   for r in rounds for p in positions)
+
+    def certainty(self, round: int, position: int) -> Tuple[int, float, float]:
+        """Number of certainty values, their mean and standard deviation for the position in the round."""
+        offset = self._offset(round, position) * 3
+        count, mean, m2 = self._certainty[offset:offset + 3]
+
+        return int(count), mean, math.sqrt(m2 / count) if count else 0.0
+
+    def results(self, round: Optional[int] = None):
+        return [result for result in self._results if round is None or result["round"] == round]
+
+    def round_summary(self, round: int):
+        positions = {}
+        for position in range(1, self._positions):
+            counts = {column: self.count(column, round, position) for column in self._columns}
+            if not any(counts.values()):
+                continue
+            count, mean, std = self.certainty(round, position)
+            positions[str(position)] = {"counts": {k: v for k, v in counts.items() if v},
+                                        "certainty": {"count": count, "mean": mean, "std": std}}
+
+        return {"round": round, "positions": positions, "results": self.results(round)}
+
+    def to_dict(self, rounds: Optional[Iterable[int]] = None):
+        rounds = rounds if rounds is not None else range(1, self._rounds)
+
+        return {"rounds": [summary for summary in (self.round_summary(r) for r in rounds) if summary["positions"]]}
+
+    def snapshot(self) -> dict:
+        """The complete state of the statistics, to continue them after a restart with :meth:`restore`."""
+        return {"columns": list(self._columns), "counts": self._counts.tolist(), "certainty": self._certainty.tolist(),
+                "results": list(self._results)}
+
+    def restore(self, snapshot: dict):
+        cells = self._rounds * self._positions
+        if len(snapshot["counts"]) != cells * len(snapshot["columns"]) or len(snapshot["certainty"]) != cells * 3:
+            raise ValueError(f"Statistics snapshot does not match {self._rounds - 1} rounds "
+                             f"and {self._positions - 1} positions")
+
+        self._columns = list(snapshot["columns"])
+        self._column_index = {column: idx for idx, column in enumerate(self._columns)}
+        self._counts = array('I', snapshot["counts"])
+        self._certainty = array('d', snapshot["certainty"])
+        self._results = list(snapshot["results"])
+
+    def _increment(self, round: int, position: int, column: str):
+        if column not in self._column_index:
+            self._column_index[column] = len(self._columns)
+            self._grow(column)
+        self._counts[self._offset(round, position) * len(self._columns) + self._column_index[column]] += 1
+
+    def _grow(self, column: str):
+        # Status unknown at construction, widen the column dimension
+        width = len(self._columns)
+        counts = array('I', bytes(array('I').itemsize * self._rounds * self._positions * (width + 1)))
+        for cell in range(self._rounds * self._positions):
+            counts[cell * (width + 1):cell * (width + 1) + width] = self._counts[cell * width:(cell + 1) * width]
+        self._counts = counts
+        self._columns.append(column)
+
+    def _offset(self, round: int, position: int):
+        if not 0 <= round < self._rounds or not 0 <= position < self._positions:
+            raise ValueError(f"Invalid round or position: {round}, {position}")
+
+        return round * self._positions + position
@@ -0,0 +1,88 @@
+import dataclasses
+import logging
+import re
+from typing import Any, FrozenSet, Mapping, Optional, Pattern, Sequence, Tuple, Union
+
+PHRASE_KEYS = (
+    "START_ROUND_1_PHRASES",
+    "START_ROUND_PHRASES",
+    "QUERY_NEXT_POS_1_PHRASES",
+    "QUERY_NEXT_PHRASES",
+    "QUERY_NEXT_REPAIR_PHRASES",
+    "NO_MATCH_PHRASES",
+    "REPAIR_NEG_RESPONSE_PHRASES",
+    "MATCH_PREVIOUS_PHRASES",
+    "SKIP_CHARACTER_PHRASES",
+    "ACKNOWLEDGE_NEE_PHRASES",
+    "ACKNOWLEDGE_FAILED_PHRASES",
+    "ACKNOWLEDGE_SAME_POSITION_PHRASES",
+    "ACKNOWLEDGE_DIFFERENT_POSITION_PHRASES",
+    "ENCOURAGEMENT_PHRASES",
+    "ROUND_FINISH_PHRASES",
+    "FINISH_ROUND_1_PHRASES",
+    "FINISH_ROUND_PHRASES",
+    "FINISH_GAME_PHRASES",
+)
+
+FIRST_SESSION_PHRASE_KEYS = ("ACKNOWLEDGE_HINT_ROUND_1_PHRASES",)
+
+CONVERSATIONS = ("start", "intro", "outro")
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass(frozen=True)
+class DialogConfig:
+    """Configuration of the DialogManager for a single session, validated and resolved once."""
+    session: int
+    phrases: Mapping[str, Union[str, Tuple[str, ...]]]
+    conversations: Mapping[str, Sequence[Any]]
+    preference_pattern: Optional[Pattern]
+    rounds: int
+    max_position: int
+    questionnaire_rounds: FrozenSet[int]
+
+    @classmethod
+    def compile(cls, phrases: Mapping, preferences: Mapping[str, Sequence[str]], session, rounds: int,
+                max_position: int, questionnaires: Sequence[int], disambiguator_positions: Optional[int] = None):
+        """Resolve the session specific phrases and check them against the keys used by the DialogManager.
+
+        Raises a ValueError if the configuration is incomplete or inconsistent.
+        """
+        session_key = str(session)
+        if session_key not in phrases:
+            raise ValueError(f"No phrases configured for session {session_key}")
+        session_phrases = phrases[session_key]
+
+        required = PHRASE_KEYS + (FIRST_SESSION_PHRASE_KEYS if int(session) == 1 else ())
+        resolved = {}
+        for key in required:
+            choices = session_phrases[key] if key in session_phrases else phrases.get(key)
+            if not choices or not (isinstance(choices, str) or all(isinstance(choice, str) for choice in choices)):
+                raise ValueError(f"Missing or invalid phrases for {key} in session {session_key}: {choices}")
+            resolved[key] = choices if isinstance(choices, str) else tuple(choices)
+
+        conversations = {conversation: tuple(session_phrases[conversation])
+                         for conversation in CONVERSATIONS
+                         if conversation in session_phrases and session_phrases[conversation]}
+
+        preference_pattern = None
+        if any(store_input for _, store_input in conversations.get("outro", ())):
+            if not preferences or not preferences.get(session_key):
+                raise ValueError(f"No preferences configured for the outro of session {session_key}")
+            preference_pattern = re.compile("|".join(pref.lower() for pref in preferences[session_key]))
+
+        if rounds < 1 or max_position < 1:
+            raise ValueError(f"Invalid number of rounds ({rounds}) or positions ({max_position})")
+        if disambiguator_positions is not None and disambiguator_positions != max_position:
+            raise ValueError(f"Maximum position {max_position} does not match the "
+                             f"{disambiguator_positions} positions of the disambiguator")
+        invalid_rounds = [questionnaire for questionnaire in questionnaires if questionnaire < 1]
+        if invalid_rounds:
+            raise ValueError(f"Invalid questionnaire rounds: {invalid_rounds}")
+        unused_rounds = [questionnaire for questionnaire in questionnaires if questionnaire > rounds]
+        if unused_rounds:
+            logger.warning("Questionnaire rounds %s are beyond the last of %s rounds", unused_rounds, rounds)
+
+        return cls(int(session), resolved, conversations, preference_pattern, rounds, max_position,
+                   frozenset(questionnaires))
@@ -3,15 +3,17 @@ import enum
 import json
 import logging
 import os
-import random
 import re
 from enum import Enum, auto
-from pathlib import Path
-from typing import Optional, Any, Mapping, List
-
-from spot.pragmatic_model.model_ambiguity import DisambiguatorStatus
+from typing import Optional, Mapping, List
 
+from spot.dialog import storage
+from spot.dialog.analytics import RoundStatistics
+from spot.dialog.config import DialogConfig
 from spot.dialog.conversations import IntroStep, GameStartStep, OutroStep
+from spot.dialog.journal import Journal, RecordKind
+from spot.dialog.schedule import PhraseScheduler
+from spot.dialog.status import DisambiguatorStatus, DisambiguationOutcome
 
 logger = logging.getLogger(__name__)
 
@@ -67,7 +69,7 @@ class State:
     position: int = 0
     utterance: Optional[str] = None
     mention: Optional[str] = None
-    disambiguation_result: Optional[Any] = None
+    disambiguation_result: Optional[DisambiguationOutcome] = None
     attempt_counter: int = 1
     confirmation: Optional[ConfirmationState] = None
 
@@ -108,20 +110,41 @@ class DisambigutionResult:
     selected: int
     certainty: float
     status: DisambiguatorStatus
+    mention: Optional[str] = None
+    duration: Optional[float] = None
+
+
+# Disambiguator status -> (next state, confirmation), other statuses are repaired
+_DISAMBIGUATION_TRANSITIONS = {
+    DisambiguatorStatus.SUCCESS_HIGH: (ConvState.ACKNOWLEDGE, ConfirmationState.ACCEPTED),
+    DisambiguatorStatus.SUCCESS_LOW: (ConvState.ACKNOWLEDGE, ConfirmationState.CONFIRM),
+}
+
+# Disambiguator status -> phrases used for repair
+_REPAIR_PHRASES = {
+    DisambiguatorStatus.NO_MATCH: "NO_MATCH_PHRASES",
+    DisambiguatorStatus.NEG_RESPONSE: "REPAIR_NEG_RESPONSE_PHRASES",
+    DisambiguatorStatus.MATCH_PREVIOUS: "MATCH_PREVIOUS_PHRASES",
+}
 
 
 class DialogManager:
     def __init__(self, disambiguator, phrases: Mapping, preferences: Mapping[str, List[str]], session: int, storage_path: str,
-                 rounds=6, max_position=5, questionnaires=[1, 6], success_threshold=0.3, high_engagement=True):
+                 rounds=6, max_position=5, questionnaires=[1, 6], success_threshold=0.3, high_engagement=True,
+                 disambiguator_positions=None, journal: Journal = None, checkpoint_path: str = None):
         self._disambiguator = disambiguator
+        self._journal = journal
+        self._checkpoint_path = checkpoint_path
         self._session = session
         self._phrases = phrases
         self._preferences = preferences
         self._storage_path = storage_path
         self._success_threshold = success_threshold
-        self._positions = max_position
-        self._rounds = rounds
-        self._questionaire_rounds = questionnaires
+        self._questionnaires = questionnaires
+        # Number of positions in the scene the disambiguator was created with, max_position must match it if given
+        self._disambiguator_positions = disambiguator_positions
+        self._config = DialogConfig.compile(phrases, preferences, session, rounds, max_position, questionnaires,
+                                            self._disambiguator_positions)
         self.high_engagement = high_engagement
 
         self._participant_id = None
@@ -129,8 +152,28 @@ class DialogManager:
 
         self._state = State(ConvState.GAME_INIT)
         self._uncommitted_state = None
+        self._uncommitted_result = None
         self._round = 0
         self._encouragement_chance = 0.20
+        self._scheduler = PhraseScheduler.for_participant(self._config, None, self._encouragement_chance)
+
+        self._statistics = RoundStatistics(rounds, max_position, [status.name for status in DisambiguatorStatus])
+
+    @property
+    def config(self) -> DialogConfig:
+        return self._config
+
+    @property
+    def journal(self) -> Optional[Journal]:
+        return self._journal
+
+    @journal.setter
+    def journal(self, journal: Optional[Journal]):
+        self._journal = journal
+
+    @property
+    def storage_path(self) -> Optional[str]:
+        return self._storage_path
 
     @property
     def participant_id(self):
@@ -144,12 +187,60 @@ class DialogManager:
     def interaction(self):
         return self._session
 
+    @property
+    def uncommitted(self) -> bool:
+        """Whether a disambiguation awaits a continuation of the utterance and is not committed yet."""
+        return self._uncommitted_state is not None
+
+    @property
+    def resettable(self) -> bool:
+        """Whether the manager can be reused for a next participant, which requires a disambiguator with ``reset``."""
+        return callable(getattr(self._disambiguator, "reset", None))
+
+    @property
+    def statistics(self) -> RoundStatistics:
+        return self._statistics
+
+    def reset(self, session: Optional[int] = None):
+        """Return the manager to the initial GAME_INIT state for the next participant.
+
+        The disambiguator is kept and its ``reset`` method is called to clear its game state and interaction history.
+        Without it the disambiguator would carry the game of the previous participant into the next, which is logged
+        as a warning (see :attr:`resettable`).
+        """
+        if session is not None and session != self._session:
+            self._config = DialogConfig.compile(self._phrases, self._preferences, session, self._config.rounds,
+                                                self._config.max_position, self._questionnaires,
+                                                self._disambiguator_positions)
+            self._session = session
+
+        self._participant_id = None
+        self._participant_name = None
+        self._state = State(ConvState.GAME_INIT)
+        self._uncommitted_state = None
+        self._uncommitted_result = None
+        self._round = 0
+        self._scheduler = PhraseScheduler.for_participant(self._config, None, self._encouragement_chance)
+        self._statistics = RoundStatistics(self._config.rounds, self._config.max_position,
+                                           [status.name for status in DisambiguatorStatus])
+
+        if self.resettable:
+            self._disambiguator.reset()
+        else:
+            logger.warning("Disambiguator %s cannot be reset, it keeps the state of the previous participant",
+                           type(self._disambiguator).__name__)
+
+        logger.debug("Reset dialog manager for session %s", self._session)
+
     def game_event(self, event):
         logger.debug("Input (Game): %s", event)
+        if self._journal:
+            self._record(RecordKind.GAME_INPUT, self._state, str(event))
         return self.run(None, event)
 
     def utterance(self, utterance: str):
         logger.debug("Input: (Text) %s", utterance)
+        self._record(RecordKind.TEXT_INPUT, self._state, utterance)
         return self.run(utterance, None)
 
     def commit(self):
@@ -160,6 +251,10 @@ class DialogManager:
         self._disambiguator.commit_status()
         self._state = self._uncommitted_state
         self._uncommitted_state = None
+        self._record(RecordKind.COMMIT, self._state)
+        if self._uncommitted_result:
+            self._record_result(self._state, self._uncommitted_result)
+            self._uncommitted_result = None
 
         return self.run(None, None)
 
@@ -178,8 +273,10 @@ class DialogManager:
                     reply += " \\pau=1000\\" + action.reply
                 else:
                     reply = action.reply
-            logger.debug("Transition from %s to %s (reply: %s, wait: %s, uncommitted: %s)", self._format_state(self._state),
-                         self._format_state(next_state), reply, action.await_input, self._uncommitted_state)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Transition from %s to %s (reply: %s, wait: %s, uncommitted: %s)", self._format_state(self._state),
+                             self._format_state(next_state), reply, action.await_input, self._uncommitted_state)
+            self._record(RecordKind.TRANSITION, next_state, self._state.conv_state.name)
             self._state = next_state
 
         if await_continuation:
@@ -187,6 +284,9 @@ class DialogManager:
         else:
             self._state = next_state.transition(self._state.conv_state, utterance=None, mention=None)
 
+        if reply:
+            self._record(RecordKind.REPLY, self._state, reply)
+
         return reply, self._state, action.await_input, annotations, await_continuation
 
     def act(self, utterance, game_transition, state):
@@ -225,9 +325,13 @@ class DialogManager:
         if game_transition:
             self._participant_id = game_transition.participant_id
             self._participant_name = game_transition.participant_name
-            if self._session in [2, 3]:
+            self._scheduler = PhraseScheduler.for_participant(self._config, self._participant_id,
+                                                              self._encouragement_chance)
+            if self._config.session in (2, 3):
                 self.load_interaction()
             logger.info("Start game for %s", self._participant_id)
+            if self._journal:
+                self._record(RecordKind.PARTICIPANT, state, f"{self._participant_id} {self._participant_name}")
             action = Action()
             next_state = state.transition(ConvState.GAME_START)
         else:
@@ -282,9 +386,9 @@ class DialogManager:
         self._disambiguator.advance_round(start=(game_round == 1))
 
         if game_round == 1:
-            action = Action(self._get_phrase("START_ROUND_1_PHRASES"))
+            action = Action(self._get_phrase("START_ROUND_1_PHRASES", state.round))
         else:
-            action = Action(self._get_phrase("START_ROUND_PHRASES"))
+            action = Action(self._get_phrase("START_ROUND_PHRASES", state.round))
         next_state = state.transition(ConvState.QUERY_NEXT, round=game_round, position=1, utterance=None,
                                       mention=None, disambiguation_result=None, confirmation=None)
 
@@ -293,15 +397,15 @@ class DialogManager:
     def _act_query_next(self, state):
         # Eventually check the disambiguator state if there is already information available
         # if asking for next position
-        if DisambiguatorStatus.AWAIT_NEXT.name == self._disambiguator.status():
+        if DisambiguatorStatus.AWAIT_NEXT == DisambiguatorStatus.of(self._disambiguator):
             if 1 == state.position:
-                action = Action(self._get_phrase("QUERY_NEXT_POS_1_PHRASES"), await_input=Input.REPLY)
+                action = Action(self._get_phrase("QUERY_NEXT_POS_1_PHRASES", state.round), await_input=Input.REPLY)
             else:
-                action = Action(self._get_phrase("QUERY_NEXT_PHRASES").format_map({"position": state.position}), Input.REPLY)
+                action = Action(self._get_phrase("QUERY_NEXT_PHRASES", state.round).format_map({"position": state.position}), Input.REPLY)
             next_state = state.transition(ConvState.DISAMBIGUATION, attempt_counter=1)
         # if coming from repair
         else:
-            action = Action(self._get_phrase("QUERY_NEXT_REPAIR_PHRASES").format_map({"position": state.position}), Input.REPLY)
+            action = Action(self._get_phrase("QUERY_NEXT_REPAIR_PHRASES", state.round).format_map({"position": state.position}), Input.REPLY)
             next_state = state.transition(ConvState.DISAMBIGUATION)
 
         return action, next_state
@@ -318,26 +422,29 @@ class DialogManager:
             # TODO if no mention, go to repair (No match) or clear utterance and wait for the next one (to be decided)
             next_state = state.transition(ConvState.DISAMBIGUATION if mention else state.conv_state, mention=mention)
         elif state.mention:
-            disambiguation_result = self._disambiguator.disambiguate(state.mention, force_commit=False)
-            selected = disambiguation_result[0]
-            certainty = disambiguation_result[1]
-            await_continuation = disambiguation_result[4]
-            status = self._disambiguator.status(uncommitted=await_continuation)
-            annotation = DisambigutionResult(selected=selected, certainty=certainty, status=status)
+            disambiguation_result = DisambiguationOutcome.disambiguate(self._disambiguator, state.mention)
+            await_continuation = disambiguation_result.await_continuation
+            annotation = DisambigutionResult(selected=disambiguation_result.selected,
+                                             certainty=disambiguation_result.certainty,
+                                             status=disambiguation_result.status.name)
+            if self._journal:
+                self._record(RecordKind.DISAMBIGUATION, state,
+                             f"{disambiguation_result.status.name} {disambiguation_result.selected} "
+                             f"{disambiguation_result.certainty} {'continue' if await_continuation else ''}")
 
             action = Action()
-            if DisambiguatorStatus.SUCCESS_HIGH.name == status:
-                next_state = state.transition(ConvState.ACKNOWLEDGE, disambiguation_result=disambiguation_result, confirmation=ConfirmationState.ACCEPTED)
-            elif DisambiguatorStatus.SUCCESS_LOW.name == status:
-                next_state = state.transition(ConvState.ACKNOWLEDGE,  disambiguation_result=disambiguation_result, confirmation=ConfirmationState.CONFIRM)
-            else:
-                next_state = state.transition(ConvState.REPAIR, disambiguation_result=disambiguation_result)
+            conv_state, confirmation = _DISAMBIGUATION_TRANSITIONS.get(disambiguation_result.status, (ConvState.REPAIR, None))
+            next_state = state.transition(conv_state, disambiguation_result=disambiguation_result, confirmation=confirmation)
 
             if await_continuation:
                 action = Action(await_input=Input.REPLY)
                 self._uncommitted_state = next_state
+                self._uncommitted_result = annotation
                 next_state = state.transition(state.conv_state, disambiguation_result=disambiguation_result,
                                               utterance=None, mention=None)
+            else:
+                self._uncommitted_result = None
+                self._record_result(state, annotation)
         else:
             action = Action(await_input=Input.REPLY)
             next_state = state
@@ -353,18 +460,20 @@ class DialogManager:
             # self._disambiguator.confirm_character_position(selected, state.mention)
             # logging.debug("State mention: %s", state.mention)
             position = state.position + 1
-            if position < 6:
+            if position <= self._config.max_position:
                 self._disambiguator.advance_position()
 
             next_state = state.transition(
-                ConvState.QUERY_NEXT if position <= self._positions else ConvState.ROUND_FINISH,
+                ConvState.QUERY_NEXT if position <= self._config.max_position else ConvState.ROUND_FINISH,
                 position=position, utterance=None, mention=None, disambiguation_result=None, confirmation=None)
         elif ConfirmationState.CONFIRM == state.confirmation:
             reply = self._acknowledge(state, confirm=True)
             action = Action(reply, await_input=Input.REPLY)
             next_state = state.transition(state.conv_state, confirmation=ConfirmationState.REQUESTED)
         elif ConfirmationState.REQUESTED == state.confirmation:
-            if 'Ok' in utterance:
+            if not utterance:
+                return Action(await_input=Input.REPLY), state
+            elif 'Ok' in utterance:
                 logger.debug("Ignore Ok during acknowledge")
                 return Action(await_input=Input.REPLY), state
             elif re.search(r"\bja\b", utterance.lower()):
@@ -372,20 +481,21 @@ class DialogManager:
                 next_state = state.transition(state.conv_state, confirmation=ConfirmationState.ACCEPTED)
             elif re.search(r"\bnee\b", utterance.lower()):
                 if state.attempt_counter > 3:
+                    self._statistics.record_skip(state.round, state.position)
                     position = state.position + 1
-                    if position < 6:
+                    if position <= self._config.max_position:
                         self._disambiguator.advance_position(skip=True)
-                    action = Action(self._get_phrase("SKIP_CHARACTER_PHRASES"))
+                    action = Action(self._get_phrase("SKIP_CHARACTER_PHRASES", state.round))
                     next_state = state.transition(
-                        ConvState.QUERY_NEXT if position <= self._positions else ConvState.ROUND_FINISH,
+                        ConvState.QUERY_NEXT if position <= self._config.max_position else ConvState.ROUND_FINISH,
                         position=position, utterance=None, mention=None, disambiguation_result=None, confirmation=None)
                 else:
-                    action = Action(self._get_phrase("ACKNOWLEDGE_NEE_PHRASES"))
+                    action = Action(self._get_phrase("ACKNOWLEDGE_NEE_PHRASES", state.round))
                     # Restart, but stay in the same position
                     next_state = state.transition(ConvState.QUERY_NEXT, utterance=None, mention=None, disambiguation_result=None, confirmation=None,
                                               attempt_counter=state.attempt_counter + 1)
             else:
-                action = Action(self._get_phrase("ACKNOWLEDGE_FAILED_PHRASES"), await_input=Input.REPLY)
+                action = Action(self._get_phrase("ACKNOWLEDGE_FAILED_PHRASES", state.round), await_input=Input.REPLY)
                 next_state = state
         else:
             raise ValueError("Invalid confirmation status " + str(state.confirmation))
@@ -393,45 +503,49 @@ class DialogManager:
         return action, next_state
 
     def _act_repair(self, state):
-        if DisambiguatorStatus.NO_MATCH.name == self._disambiguator.status():
-            action = Action(self._get_phrase("NO_MATCH_PHRASES"), await_input=Input.REPLY)
-        elif DisambiguatorStatus.NEG_RESPONSE.name == self._disambiguator.status():
-            action = Action(self._get_phrase("REPAIR_NEG_RESPONSE_PHRASES"), await_input=Input.REPLY)
-        elif DisambiguatorStatus.MATCH_PREVIOUS.name == self._disambiguator.status():
-            action = Action(self._get_phrase("MATCH_PREVIOUS_PHRASES"), await_input=Input.REPLY)
-        elif DisambiguatorStatus.MATCH_MULTIPLE.name == self._disambiguator.status():
-            description = state.disambiguation_result[3]
-            action = Action(f"{description}?", await_input=Input.REPLY)
-        else:
-            raise ValueError(f"Illegal state for disambiguator status: {self._disambiguator.status()}")
-
         if state.attempt_counter > 3:
+            self._statistics.record_skip(state.round, state.position)
             position = state.position + 1
-            if position < 6:
+            if position <= self._config.max_position:
                 self._disambiguator.advance_position(skip=True)
-            action = Action(self._get_phrase("SKIP_CHARACTER_PHRASES"))
-            next_state = state.transition(ConvState.QUERY_NEXT if position <= self._positions else ConvState.ROUND_FINISH,
+            action = Action(self._get_phrase("SKIP_CHARACTER_PHRASES", state.round))
+            next_state = state.transition(ConvState.QUERY_NEXT if position <= self._config.max_position else ConvState.ROUND_FINISH,
                 position=position, utterance=None, mention=None, disambiguation_result=None, confirmation=None)
+
+            return action, next_state
+
+        status = state.disambiguation_result.status if state.disambiguation_result else None
+        if status in _REPAIR_PHRASES:
+            action = Action(self._get_phrase(_REPAIR_PHRASES[status], state.round), await_input=Input.REPLY)
+        elif DisambiguatorStatus.MATCH_MULTIPLE == status:
+            action = Action(f"{state.disambiguation_result.description}?", await_input=Input.REPLY)
         else:
-            next_state = state.transition(ConvState.DISAMBIGUATION, utterance=None, mention=None,
-                                          disambiguation_result=None, attempt_counter=state.attempt_counter + 1)
+            # Repair statuses without a dedicated repair as no match instead of failing the dialog
+            logger.warning("Repair for unexpected disambiguator status: %s", status)
+            action = Action(self._get_phrase("NO_MATCH_PHRASES", state.round), await_input=Input.REPLY)
+            status = DisambiguatorStatus.NO_MATCH
+
+        self._statistics.record_repair(state.round, state.position, status.name)
+        next_state = state.transition(ConvState.DISAMBIGUATION, utterance=None, mention=None,
+                                      disambiguation_result=None, attempt_counter=state.attempt_counter + 1)
 
         return action, next_state
 
     def _act_round_finished(self, game_transition, state):
         if game_transition:
             self.save_interaction()
+            self.save_checkpoint(state)
             action = Action()
             next_state = state.transition(ConvState.ROUND_START if self.has_next_round(state) else ConvState.OUTRO)
-        elif state.round not in self._questionaire_rounds and state.conv_state != ConvState.QUESTIONNAIRE:
-            reply = self._get_phrase("ROUND_FINISH_PHRASES")
+        elif state.round not in self._config.questionnaire_rounds and state.conv_state != ConvState.QUESTIONNAIRE:
+            reply = self._get_phrase("ROUND_FINISH_PHRASES", state.round)
             action = Action(reply, await_input=Input.GAME if self.has_next_round(state) else None)
             next_state = state.transition(ConvState.QUESTIONNAIRE if self.has_next_round(state) else ConvState.OUTRO)
         elif state.conv_state == ConvState.ROUND_FINISH:
             if state.round == 1:
-                reply = self._get_phrase("FINISH_ROUND_1_PHRASES")
+                reply = self._get_phrase("FINISH_ROUND_1_PHRASES", state.round)
             else:
-                reply = self._get_phrase("FINISH_ROUND_PHRASES")
+                reply = self._get_phrase("FINISH_ROUND_PHRASES", state.round)
             action = Action(reply.format_map({"name": self.participant_name}), await_input=Input.GAME)
             next_state = state.transition(ConvState.QUESTIONNAIRE)
         else:
@@ -456,7 +570,7 @@ class DialogManager:
                     self.save_preferences(utterance, preference)
                     return Action(), state.transition(ConvState.OUTRO, utterance=utterance)
                 else:
-                    return (Action(reply=self._get_phrase("NO_MATCH_PHRASES"), await_input=Input.REPLY),
+                    return (Action(reply=self._get_phrase("NO_MATCH_PHRASES", state.round), await_input=Input.REPLY),
                             state.transition(ConvState.OUTRO, attempt_counter=state.attempt_counter + 1))
             else:
                 # No response, wait..
@@ -472,15 +586,15 @@ class DialogManager:
         return action, next_state
 
     def _act_game_finished(self, state):
-        action = Action(self._get_phrase("FINISH_GAME_PHRASES"), await_input=Input.GAME)
+        action = Action(self._get_phrase("FINISH_GAME_PHRASES", state.round), await_input=Input.GAME)
 
         self.save_interaction()
+        self.clear_checkpoint()
 
         return action, state
 
     def parse_preference(self, utterance):
-        expected_reg = re.compile("|".join(pref.lower() for pref in self._preferences[str(self._session)]))
-        preferences = {p for p in expected_reg.findall(utterance.lower())}
+        preferences = {p for p in self._config.preference_pattern.findall(utterance.lower())}
         preference = next(iter(preferences)) if len(preferences) == 1 else ""
 
         return preference
@@ -489,9 +603,9 @@ class DialogManager:
         if not self._storage_path:
             return
 
-        data_path = self._get_preferences_path(self._participant_id, self._session, self._storage_path)
+        existing_path = self._get_preferences_path(self._participant_id, self._session, self._storage_path)
         try:
-            with open(data_path, 'r') as data_file:
+            with open(existing_path, 'r') as data_file:
                 data = json.load(data_file)
         except:
             data = {}
@@ -499,15 +613,19 @@ class DialogManager:
         data["answer"] = utterance
         data["preference"] = preference
 
+        data_path = self._get_preferences_path(self._participant_id, self._session, self._storage_path, create=True)
         with open(data_path, 'w') as data_file:
             json.dump(data, data_file)
+        if existing_path != data_path and os.path.exists(existing_path):
+            # Migrated to the sharded layout
+            os.remove(existing_path)
 
     @staticmethod
     def load_preferences(participant_id:str, session: int, storage_path: str):
         if session == 1:
             return ""
 
-        data_path = DialogManager._get_preferences_path(participant_id, session - 1, storage_path)
+        data_path = storage.resolve_path(storage_path, participant_id, session - 1, "preferences")
 
         with open(data_path, 'r') as data_file:
             data = json.load(data_file)
@@ -515,24 +633,89 @@ class DialogManager:
         return data["preference"]
 
     @staticmethod
-    def _get_preferences_path(participant_id, session, storage_path):
-        storage_dir = os.path.join(storage_path, "dialog")
-        Path(storage_dir).mkdir(parents=True, exist_ok=True)
+    def _get_preferences_path(participant_id, session, storage_path, create=False):
+        if create:
+            return storage.data_path(storage_path, participant_id, session, "preferences", create=True)
 
-        return os.path.join(storage_dir, f"pp_{participant_id}_int{session}_preferences.json")
+        return storage.resolve_path(storage_path, participant_id, session, "preferences")
 
     def save_interaction(self):
         self._disambiguator.save_interaction(self._storage_path, self._participant_id, self._session)
+        self.save_statistics()
+
+    def save_statistics(self):
+        if not self._storage_path:
+            return
+
+        data_path = storage.data_path(self._storage_path, self._participant_id, self._session, "statistics", create=True)
+        with open(data_path, 'w') as data_file:
+            json.dump(self._statistics.to_dict(), data_file)
 
     def load_interaction(self):
         self._disambiguator.load_interaction(self._storage_path, self._participant_id, str(int(self._session)-1))
 
+    def save_checkpoint(self, state):
+        if not self._checkpoint_path:
+            return
+
+        checkpoint = {"session": self._session, "participant_id": self._participant_id,
+                      "participant_name": self._participant_name, "round": state.round,
+                      "statistics": self._statistics.snapshot()}
+        tmp_path = self._checkpoint_path + ".tmp"
+        with open(tmp_path, 'w') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+        os.replace(tmp_path, self._checkpoint_path)
+
+    def clear_checkpoint(self):
+        if self._checkpoint_path and os.path.exists(self._checkpoint_path):
+            os.remove(self._checkpoint_path)
+
+    def restore(self) -> bool:
+        """Restore the game of a participant from the checkpoint saved after the last finished round.
+
+        The interaction saved with the checkpoint is loaded into the disambiguator, the round statistics are restored
+        from the checkpoint and the dialog continues with the start of the next round. Returns ``False`` if there is no checkpoint to restore.
+        """
+        if not self._checkpoint_path or not os.path.exists(self._checkpoint_path):
+            return False
+
+        with open(self._checkpoint_path, 'r') as checkpoint_file:
+            checkpoint = json.load(checkpoint_file)
+        if str(checkpoint["session"]) != str(self._session):
+            logger.warning("Ignored checkpoint of session %s in session %s", checkpoint["session"], self._session)
+            return False
+
+        self._participant_id = checkpoint["participant_id"]
+        self._participant_name = checkpoint["participant_name"]
+        self._scheduler = PhraseScheduler.for_participant(self._config, self._participant_id, self._encouragement_chance)
+        self._disambiguator.load_interaction(self._storage_path, self._participant_id, str(self._session))
+        if "statistics" in checkpoint:
+            self._statistics.restore(checkpoint["statistics"])
+        game_round = checkpoint["round"]
+        self._state = State(ConvState.ROUND_START if game_round < self._config.rounds else ConvState.OUTRO, round=game_round)
+        if self._journal:
+            self._record(RecordKind.PARTICIPANT, self._state,
+                         f"{self._participant_id} {self._participant_name} (restored)")
+        logger.info("Restored game for %s after round %s", self._participant_id, game_round)
+
+        return True
+
+    def _record(self, kind: RecordKind, state: State, payload: Optional[str] = None):
+        if self._journal:
+            self._journal.record(kind, state.conv_state.value, state.round, state.position, state.attempt_counter,
+                                 payload)
+
+    def _record_result(self, state, result):
+        self._statistics.record_disambiguation(state.round, state.position, state.attempt_counter,
+                                               result.selected, result.certainty, result.status)
+
     def get_mention(self, utterance):
         # Eventually add mention detection
         return utterance
 
     def _acknowledge(self, state, confirm):
-        selected, certainty, position, description, await_continuation = state.disambiguation_result
+        position = state.disambiguation_result.position
+        description = state.disambiguation_result.description
         # TODO Find the mention the human used for the character (see mention detection ;)
         # or unique attributes of the character
         # ref_string = f"{selected} in position {position}"
@@ -544,22 +727,22 @@ class DialogManager:
             if self.high_engagement:
                 if position == state.position:
                     # TODO is state.position already None here?
-                    response = self._get_phrase("ACKNOWLEDGE_SAME_POSITION_PHRASES").format_map({"position": position}) % description
+                    response = self._get_phrase("ACKNOWLEDGE_SAME_POSITION_PHRASES", state.round).format_map({"position": position}) % description
                 else:
-                    response = self._get_phrase("ACKNOWLEDGE_DIFFERENT_POSITION_PHRASES").format_map({"position": position}) % description
+                    response = self._get_phrase("ACKNOWLEDGE_DIFFERENT_POSITION_PHRASES", state.round).format_map({"position": position}) % description
             else:
                 if position == state.position:
-                    response = self._get_phrase("ACKNOWLEDGE_SAME_POSITION_PHRASES").format_map({"position": position}) % "die"
+                    response = self._get_phrase("ACKNOWLEDGE_SAME_POSITION_PHRASES", state.round).format_map({"position": position}) % "die"
                 else:
-                    response = self._get_phrase("ACKNOWLEDGE_DIFFERENT_POSITION_PHRASES").format_map({"position": position}) % "die"
-            if int(self._session) == 1 and state.round == 1:
-                response = response + " " + self._get_phrase("ACKNOWLEDGE_HINT_ROUND_1_PHRASES")
-            if random.random() < self._encouragement_chance:
-                response = response + " " + self._get_phrase("ENCOURAGEMENT_PHRASES")
+                    response = self._get_phrase("ACKNOWLEDGE_DIFFERENT_POSITION_PHRASES", state.round).format_map({"position": position}) % "die"
+            if self._config.session == 1 and state.round == 1:
+                response = response + " " + self._get_phrase("ACKNOWLEDGE_HINT_ROUND_1_PHRASES", state.round)
+            if self._scheduler.encourage(state.round):
+                response = response + " " + self._get_phrase("ENCOURAGEMENT_PHRASES", state.round)
             return response
 
     def has_next_round(self, state):
-        return state.round < self._rounds
+        return state.round < self._config.rounds
 
     def _format_state(self, value):
         if isinstance(value, dict):
@@ -574,19 +757,11 @@ class DialogManager:
         else:
             return value
 
-    def _get_phrase(self, key: str):
-        session_key = str(self._session)
-
-        choices = self._phrases[session_key][key] if key in self._phrases[session_key] else self._phrases[key]
-
-        return choices if isinstance(choices, str) else random.choice(choices)
+    def _get_phrase(self, key: str, game_round: int):
+        return self._scheduler.phrase(key, game_round)
 
     def _get_phrases(self, conversation: str):
-        session_key = str(self._session)
-
-        return self._phrases[session_key][conversation]
+        return self._config.conversations[conversation]
 
     def _has_conversation(self, conversation: str):
-        session_key = str(self._session)
-
-        return conversation in self._phrases[session_key] and self._phrases[session_key][conversation]
+        return conversation in self._config.conversations
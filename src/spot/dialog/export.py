@@ -0,0 +1,153 @@
+"""Compact the per participant dialog files of a study into a single indexed SQLite database.
+
+Ingestion is incremental: files that were already ingested and did not change since are skipped, changed files
+replace the rows they contributed before.
+
+Usage: ``python -m spot.dialog.export <storage_path> <database>``
+"""
+import argparse
+import json
+import logging
+import os
+import sqlite3
+
+from spot.dialog.storage import KINDS, data_files
+
+logger = logging.getLogger(__name__)
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS ingested (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS preferences (
+    participant_id TEXT NOT NULL,
+    session INTEGER NOT NULL,
+    answer TEXT,
+    preference TEXT,
+    PRIMARY KEY (participant_id, session)
+);
+CREATE TABLE IF NOT EXISTS position_counts (
+    participant_id TEXT NOT NULL,
+    session INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    counter TEXT NOT NULL,
+    count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS position_certainty (
+    participant_id TEXT NOT NULL,
+    session INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    mean REAL,
+    std REAL
+);
+CREATE TABLE IF NOT EXISTS disambiguation (
+    participant_id TEXT NOT NULL,
+    session INTEGER NOT NULL,
+    round INTEGER NOT NULL,
+    position INTEGER NOT NULL,
+    attempt INTEGER,
+    selected TEXT,
+    certainty REAL,
+    status TEXT
+);
+CREATE INDEX IF NOT EXISTS position_counts_participant ON position_counts (participant_id, session);
+CREATE INDEX IF NOT EXISTS position_counts_counter ON position_counts (counter, round, position);
+CREATE INDEX IF NOT EXISTS position_certainty_participant ON position_certainty (participant_id, session);
+CREATE INDEX IF NOT EXISTS disambiguation_participant ON disambiguation (participant_id, session);
+CREATE INDEX IF NOT EXISTS disambiguation_status ON disambiguation (status, round, position);
+"""
+
+STATISTICS_TABLES = ["position_counts", "position_certainty", "disambiguation"]
+
+
+def connect(database: str) -> sqlite3.Connection:
+    connection = sqlite3.connect(database)
+    connection.executescript(SCHEMA)
+
+    return connection
+
+
+def ingest(storage_path: str, database: str) -> int:
+    """Ingest new and changed dialog data files from the storage into the database.
+
+    Returns the number of ingested files.
+    """
+    connection = connect(database)
+    try:
+        ingested = {path: (mtime, size) for path, mtime, size in connection.execute("SELECT path, mtime, size FROM ingested")}
+
+        count = 0
+        for path, participant_id, session, kind in data_files(storage_path):
+            if kind not in KINDS:
+                continue
+
+            stat = os.stat(path)
+            if ingested.get(path) == (stat.st_mtime, stat.st_size):
+                continue
+
+            try:
+                with open(path, 'r') as data_file:
+                    data = json.load(data_file)
+            except (OSError, ValueError):
+                logger.exception("Failed to read %s", path)
+                continue
+
+            with connection:
+                if kind == "preferences":
+                    _ingest_preferences(connection, participant_id, session, data)
+                else:
+                    _ingest_statistics(connection, participant_id, session, data)
+                connection.execute("INSERT OR REPLACE INTO ingested (path, mtime, size) VALUES (?, ?, ?)",
+                                   (path, stat.st_mtime, stat.st_size))
+            count += 1
+            logger.debug("Ingested %s", path)
+    finally:
+        connection.close()
+
+    logger.info("Ingested %s files from %s into %s", count, storage_path, database)
+
+    return count
+
+
+def _ingest_preferences(connection, participant_id, session, data):
+    connection.execute("INSERT OR REPLACE INTO preferences (participant_id, session, answer, preference) VALUES (?, ?, ?, ?)",
+                       (participant_id, session, data.get("answer"), data.get("preference")))
+
+
+def _ingest_statistics(connection, participant_id, session, data):
+    for table in STATISTICS_TABLES:
+        connection.execute(f"DELETE FROM {table} WHERE participant_id = ? AND session = ?", (participant_id, session))
+
+    for summary in data.get("rounds", []):
+        game_round = summary["round"]
+        for position, position_summary in summary["positions"].items():
+            connection.executemany(
+                "INSERT INTO position_counts (participant_id, session, round, position, counter, count) VALUES (?, ?, ?, ?, ?, ?)",
+                ((participant_id, session, game_round, int(position), counter, count)
+                 for counter, count in position_summary["counts"].items()))
+            certainty = position_summary["certainty"]
+            connection.execute(
+                "INSERT INTO position_certainty (participant_id, session, round, position, count, mean, std) VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (participant_id, session, game_round, int(position), certainty["count"], certainty["mean"], certainty["std"]))
+        connection.executemany(
+            "INSERT INTO disambiguation (participant_id, session, round, position, attempt, selected, certainty, status) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            ((participant_id, session, result["round"], result["position"], result["attempt"],
+              None if result["selected"] is None else str(result["selected"]), result["certainty"], result["status"])
+             for result in summary["results"]))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Ingest dialog data of a study into a SQLite database")
+    parser.add_argument("storage", help="Storage path of the dialog service")
+    parser.add_argument("database", help="SQLite database file, created if it does not exist")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    ingest(args.storage, args.database)
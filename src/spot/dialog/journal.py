@@ -0,0 +1,127 @@
+"""Binary journal of a dialog session in a fixed-size memory-mapped ring buffer.
+
+Records have a fixed size and are written in place into the mapped file, once the buffer is full the oldest records
+are overwritten. The dialog service keeps a journal per session in ``journal_dir``, by default the ``journal``
+directory in the storage path of the DialogManager. The journal can be decoded offline into a readable trace with
+
+``python -m spot.dialog.journal <journal file>``
+"""
+import argparse
+import datetime
+import enum
+import mmap
+import os
+import struct
+import time
+from typing import Iterator, NamedTuple, Optional
+
+MAGIC = b"SPOTJRNL"
+VERSION = 1
+
+# magic, version, capacity, payload size, next sequence number
+HEADER = struct.Struct("<8sHIHQ")
+# sequence number, timestamp, kind, conversational state, round, position, attempt, payload length
+RECORD = struct.Struct("<QdBBHHHH")
+
+
+class RecordKind(enum.IntEnum):
+    GAME_INPUT = 1
+    TEXT_INPUT = 2
+    TRANSITION = 3
+    REPLY = 4
+    DISAMBIGUATION = 5
+    COMMIT = 6
+    PARTICIPANT = 7
+
+
+class JournalRecord(NamedTuple):
+    sequence: int
+    timestamp: float
+    kind: RecordKind
+    conv_state: int
+    round: int
+    position: int
+    attempt: int
+    payload: str
+
+
+class Journal:
+    def __init__(self, path: str, capacity: int = 4096, payload_size: int = 128):
+        self._path = path
+        self._capacity = capacity
+        self._payload_size = payload_size
+        self._record_size = RECORD.size + payload_size
+        size = HEADER.size + capacity * self._record_size
+
+        exists = os.path.exists(path) and os.path.getsize(path) == size
+        self._file = open(path, "r+b" if exists else "w+b")
+        if not exists:
+            self._file.truncate(size)
+        self._mmap = mmap.mmap(self._file.fileno(), size)
+
+        if exists:
+            magic, version, capacity, payload_size, self._sequence = HEADER.unpack_from(self._mmap, 0)
+            if magic != MAGIC or version != VERSION or capacity != self._capacity or payload_size != self._payload_size:
+                raise ValueError(f"Incompatible journal file {path}")
+        else:
+            self._sequence = 1
+            HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, capacity, payload_size, self._sequence)
+
+    def record(self, kind: RecordKind, conv_state: int = 0, round: int = 0, position: int = 0, attempt: int = 0,
+               payload: Optional[str] = None):
+        data = payload.encode("utf-8")[:self._payload_size] if payload else b""
+        offset = HEADER.size + (self._sequence % self._capacity) * self._record_size
+        RECORD.pack_into(self._mmap, offset, self._sequence, time.time(), kind, conv_state, round, position, attempt,
+                         len(data))
+        self._mmap[offset + RECORD.size:offset + RECORD.size + len(data)] = data
+        self._sequence += 1
+        HEADER.pack_into(self._mmap, 0, MAGIC, VERSION, self._capacity, self._payload_size, self._sequence)
+
+    def flush(self):
+        self._mmap.flush()
+
+    def close(self):
+        self._mmap.flush()
+        self._mmap.close()
+        self._file.close()
+
+
+def read(path: str) -> Iterator[JournalRecord]:
+    """Read the records of a journal file in the order they were written."""
+    with open(path, "rb") as journal_file:
+        data = journal_file.read()
+
+    magic, version, capacity, payload_size, sequence = HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"Not a journal file: {path}")
+
+    record_size = RECORD.size + payload_size
+    for seq in range(max(1, sequence - capacity), sequence):
+        offset = HEADER.size + (seq % capacity) * record_size
+        record_seq, timestamp, kind, conv_state, game_round, position, attempt, length = RECORD.unpack_from(data, offset)
+        if record_seq != seq:
+            continue
+        payload = data[offset + RECORD.size:offset + RECORD.size + length].decode("utf-8", errors="replace")
+
+        yield JournalRecord(record_seq, timestamp, RecordKind(kind), conv_state, game_round, position, attempt, payload)
+
+
+def decode(path: str) -> Iterator[str]:
+    """Decode the records of a journal file into readable trace lines."""
+    from spot.dialog.dialog_manager import ConvState
+
+    states = {state.value: state.name for state in ConvState}
+    for record in read(path):
+        timestamp = datetime.datetime.fromtimestamp(record.timestamp).isoformat(timespec="milliseconds")
+        yield (f"{timestamp} #{record.sequence} {record.kind.name:<14} {states.get(record.conv_state, '-'):<14} "
+               f"round {record.round} position {record.position} attempt {record.attempt}"
+               + (f": {record.payload}" if record.payload else ""))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Decode a dialog journal")
+    parser.add_argument("journal", help="Journal file")
+    args = parser.parse_args()
+
+    for line in decode(args.journal):
+        print(line)
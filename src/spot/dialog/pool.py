@@ -0,0 +1,134 @@
+import logging
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Optional
+
+from spot.dialog.dialog_manager import DialogManager
+
+logger = logging.getLogger(__name__)
+
+
+class DialogManagerPool:
+    """Pool of DialogManagers that are constructed and warmed up in the background.
+
+    Managers are built with the ``factory``, which is expected to create the disambiguator as well, and are
+    optionally warmed up with ``warm`` (e.g. by running a disambiguation) and reset before they become available.
+    Released managers are reset to GAME_INIT in the background and reused without rebuilding the disambiguator, if
+    the disambiguator cannot be reset a new manager is built instead (see ``DialogManager.resettable``). Use
+    :meth:`exchange` to hand in a used manager for a ready one, such that it replaces the taken one.
+    """
+    def __init__(self, factory: Callable[[], DialogManager], size: int = 1,
+                 warm: Optional[Callable[[DialogManager], None]] = None):
+        if size < 1:
+            raise ValueError(f"Invalid pool size: {size}")
+
+        self._factory = factory
+        self._warm = warm
+        self._size = size
+
+        self._ready = queue.Queue()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._executor = None
+
+    def start(self):
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix=self.__class__.__name__)
+        self._fill()
+
+        return self
+
+    def stop(self):
+        if self._executor:
+            self._executor.shutdown(wait=True)
+        self._executor = None
+
+    @property
+    def available(self) -> int:
+        return self._ready.qsize()
+
+    def acquire(self, timeout: Optional[float] = None) -> DialogManager:
+        """Take a ready manager from the pool, waiting for one to be prepared if none is available.
+
+        A new manager is built to replace it. Raises a TimeoutError if no manager is ready within the timeout.
+        """
+        manager = self._take(timeout)
+        self._fill()
+
+        return manager
+
+    def exchange(self, manager: DialogManager, session: Optional[int] = None,
+                 timeout: Optional[float] = None) -> DialogManager:
+        """Take a ready manager from the pool and return the used manager in its place.
+
+        The used manager is reset in the background and replaces the taken one. Raises a TimeoutError if no manager is
+        ready within the timeout, the used manager is then not returned to the pool.
+        """
+        ready = self._take(timeout)
+        with self._lock:
+            self._pending += 1
+        self._executor.submit(self._prepare, self._recycle(manager, session))
+
+        return ready
+
+    def release(self, manager: DialogManager, session: Optional[int] = None):
+        """Return a used manager to the pool, it is reset in the background."""
+        with self._lock:
+            if self._ready.qsize() + self._pending >= self._size:
+                logger.debug("Pool is full, discard released manager")
+                return
+            self._pending += 1
+
+        self._executor.submit(self._prepare, self._recycle(manager, session))
+
+    def _take(self, timeout: Optional[float]) -> DialogManager:
+        if not self._executor:
+            raise ValueError("Pool is not started")
+
+        try:
+            return self._ready.get(timeout=timeout)
+        except queue.Empty:
+            # Retry to build managers that failed to be prepared
+            self._fill()
+            raise TimeoutError(f"No dialog manager ready within {timeout}s")
+
+    def _fill(self):
+        with self._lock:
+            missing = self._size - self._ready.qsize() - self._pending
+            self._pending += max(missing, 0)
+
+        for _ in range(missing):
+            self._executor.submit(self._prepare, self._build)
+
+    def _prepare(self, supplier: Callable[[], DialogManager]):
+        try:
+            manager = supplier()
+            self._ready.put(manager)
+            logger.debug("Prepared dialog manager, %s available", self._ready.qsize())
+        except Exception:
+            logger.exception("Failed to prepare dialog manager")
+        finally:
+            with self._lock:
+                self._pending -= 1
+
+    def _build(self):
+        manager = self._factory()
+        if self._warm:
+            self._warm(manager)
+            manager.reset()
+
+        return manager
+
+    def _recycle(self, manager: DialogManager, session: Optional[int]) -> Callable[[], DialogManager]:
+        if not manager.resettable:
+            # Don't hand the game state of the disambiguator to the next participant
+            logger.warning("Disambiguator of the released manager cannot be reset, build a new manager instead")
+            return self._build
+
+        return lambda: self._reset(manager, session)
+
+    @staticmethod
+    def _reset(manager: DialogManager, session: Optional[int]):
+        manager.reset(session)
+
+        return manager
@@ -0,0 +1,71 @@
+import random
+import zlib
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
+
+from spot.dialog.config import DialogConfig
+
+# Minimum number of phrases per key that are planned for each position of a round
+DRAWS_PER_POSITION = 3
+
+_ENCOURAGEMENT = "__encouragement__"
+
+
+class PhraseScheduler:
+    """Precomputed, seeded sampling plan of the phrase variants and encouragements of a participant.
+
+    For each phrase key the plan has a segment for each round that cycles through all variants in shuffled order before
+    any of them is repeated. A cycle does not start with the last variant of the previous cycle, and the segment does
+    not end with its first variant, so that drawing more phrases than planned continues at the start of the segment
+    without repetition. As rounds have their own segment, the phrases of a round do not depend on the number of phrases
+    used in earlier rounds and a game restored at the start of a round continues with the same phrases. Drawing a
+    phrase only advances a cursor into the plan.
+    """
+    def __init__(self, phrases: Mapping[str, Union[str, Sequence[str]]], rounds: int, max_position: int, seed: int,
+                 encouragement_chance: float = 0.2):
+        rng = random.Random(seed)
+        self._phrases = phrases
+        self._rounds = rounds + 1
+        slots = max_position * DRAWS_PER_POSITION
+
+        self._plans = {key: [self._plan(rng, len(choices), slots) for _ in range(self._rounds)]
+                       for key, choices in sorted(phrases.items()) if not isinstance(choices, str)}
+        self._encouragements = [[rng.random() < encouragement_chance for _ in range(slots)]
+                                for _ in range(self._rounds)]
+        self._cursors: Dict[Tuple[str, int], int] = {}
+
+    @classmethod
+    def for_participant(cls, config: DialogConfig, participant_id: Optional[str], encouragement_chance: float = 0.2):
+        """Create the plan for a participant in the session of the configuration, seeded by participant and session."""
+        seed = zlib.crc32(f"{participant_id}:{config.session}".encode("utf-8"))
+
+        return cls(config.phrases, config.rounds, config.max_position, seed, encouragement_chance)
+
+    def phrase(self, key: str, game_round: int) -> str:
+        choices = self._phrases[key]
+
+        return choices if isinstance(choices, str) else choices[self._next(key, game_round, self._plans[key])]
+
+    def encourage(self, game_round: int) -> bool:
+        return self._next(_ENCOURAGEMENT, game_round, self._encouragements)
+
+    def _next(self, key: str, game_round: int, plan: List[List]):
+        cursor = self._cursors.get((key, game_round), 0)
+        self._cursors[(key, game_round)] = cursor + 1
+        segment = plan[game_round % self._rounds]
+
+        return segment[cursor % len(segment)]
+
+    @staticmethod
+    def _plan(rng: random.Random, variants: int, length: int) -> List[int]:
+        cycles = -(-length // variants)
+        plan = []
+        for cycle_index in range(cycles):
+            cycle = list(range(variants))
+            rng.shuffle(cycle)
+            # Shuffle until the cycle does not repeat the previous variant, nor the first one at the end of the segment
+            while variants > 1 and ((plan and cycle[0] == plan[-1])
+                                    or (cycle_index == cycles - 1 and cycle[-1] == (plan or cycle)[0])):
+                rng.shuffle(cycle)
+            plan.extend(cycle)
+
+        return plan
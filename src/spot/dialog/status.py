@@ -0,0 +1,50 @@
+import logging
+from enum import Enum, auto
+from typing import Any, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class DisambiguatorStatus(Enum):
+    """Status names reported by the disambiguator of ``spot.pragmatic_model``.
+
+    The disambiguator reports its status by name, this mirror allows to use the dialog state machine without
+    importing the pragmatic model. The names are checked against the pragmatic model in ``tests/test_status.py``.
+    """
+    AWAIT_NEXT = auto()
+    SUCCESS_HIGH = auto()
+    SUCCESS_LOW = auto()
+    NO_MATCH = auto()
+    NEG_RESPONSE = auto()
+    MATCH_PREVIOUS = auto()
+    MATCH_MULTIPLE = auto()
+
+    @classmethod
+    def of(cls, disambiguator, uncommitted: bool = False) -> "DisambiguatorStatus":
+        """The current status of the disambiguator, unknown statuses are handled as no match."""
+        status_name = disambiguator.status(uncommitted=uncommitted)
+        if status_name in cls.__members__:
+            return cls[status_name]
+
+        # Continue with a repair instead of failing the dialog
+        logger.warning("Unknown disambiguator status %s, continue with %s", status_name, cls.NO_MATCH.name)
+
+        return cls.NO_MATCH
+
+
+class DisambiguationOutcome(NamedTuple):
+    """Result of a single disambiguation together with the status of the disambiguator."""
+    selected: Any
+    certainty: Optional[float]
+    position: Optional[int]
+    description: Optional[str]
+    await_continuation: bool
+    status: DisambiguatorStatus
+
+    @classmethod
+    def disambiguate(cls, disambiguator, mention: str) -> "DisambiguationOutcome":
+        selected, certainty, position, description, await_continuation = \
+            disambiguator.disambiguate(mention, force_commit=False)[:5]
+        status = DisambiguatorStatus.of(disambiguator, uncommitted=bool(await_continuation))
+
+        return cls(selected, certainty, position, description, bool(await_continuation), status)
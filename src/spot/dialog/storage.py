@@ -0,0 +1,118 @@
+"""Storage layout of the per participant dialog data.
+
+Files are stored as ``<storage_path>/dialog/<shard>/pp_<participant>_int<session>_<kind>.json``, where the shard is
+derived from a hash of the participant id. This keeps directories small independent of the number of participants.
+The location of a file follows from (participant, session, kind), lookups therefore don't need a separate index and
+take the same time regardless of the number of participants.
+Flat directories of earlier versions (``<storage_path>/dialog/pp_...json``) can be migrated with
+
+``python -m spot.dialog.storage <storage_path>``
+
+Only data files of the kinds written by the DialogManager (:data:`KINDS`) are moved, other files are left in place.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import re
+from pathlib import Path
+from typing import Iterator, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+DIALOG_DIR = "dialog"
+DATA_FILE = re.compile(r"pp_(?P<participant>.+)_int(?P<session>\d+)_(?P<kind>[a-z]+)\.json")
+SHARD = re.compile(r"[0-9a-f]{2}")
+# Kinds of data files written by the DialogManager
+KINDS = {"preferences", "statistics"}
+
+
+def shard(participant_id) -> str:
+    return hashlib.sha1(str(participant_id).encode("utf-8")).hexdigest()[:2]
+
+
+def file_name(participant_id, session, kind: str) -> str:
+    return f"pp_{participant_id}_int{session}_{kind}.json"
+
+
+def data_path(storage_path: str, participant_id, session, kind: str, create: bool = False) -> str:
+    storage_dir = os.path.join(storage_path, DIALOG_DIR, shard(participant_id))
+    if create:
+        Path(storage_dir).mkdir(parents=True, exist_ok=True)
+
+    return os.path.join(storage_dir, file_name(participant_id, session, kind))
+
+
+def legacy_path(storage_path: str, participant_id, session, kind: str) -> str:
+    return os.path.join(storage_path, DIALOG_DIR, file_name(participant_id, session, kind))
+
+
+def resolve_path(storage_path: str, participant_id, session, kind: str) -> str:
+    """Path of an existing data file, falling back to the flat layout for storage that is not migrated."""
+    path = data_path(storage_path, participant_id, session, kind)
+    if not os.path.exists(path):
+        legacy = legacy_path(storage_path, participant_id, session, kind)
+        if os.path.exists(legacy):
+            return legacy
+
+    return path
+
+
+def data_files(storage_path: str) -> Iterator[Tuple[str, str, int, str]]:
+    """Stream (path, participant_id, session, kind) of all data files, in the sharded and the flat layout."""
+    storage_dir = os.path.join(storage_path, DIALOG_DIR)
+    if not os.path.isdir(storage_dir):
+        return
+
+    with os.scandir(storage_dir) as entries:
+        shards = []
+        for entry in entries:
+            if entry.is_dir() and SHARD.fullmatch(entry.name):
+                shards.append(entry.path)
+            elif entry.is_file():
+                yield from _match(entry)
+
+    for shard_dir in shards:
+        with os.scandir(shard_dir) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    yield from _match(entry)
+
+
+def migrate(storage_path: str) -> int:
+    """Move data files of the known kinds from the flat layout into their shard. Returns the number of migrated files."""
+    storage_dir = os.path.join(storage_path, DIALOG_DIR)
+    if not os.path.isdir(storage_dir):
+        return 0
+
+    with os.scandir(storage_dir) as entries:
+        flat_files = [match for entry in entries if entry.is_file() for match in _match(entry) if match[3] in KINDS]
+
+    count = 0
+    for path, participant_id, session, kind in flat_files:
+        target = data_path(storage_path, participant_id, session, kind, create=True)
+        if os.path.exists(target):
+            logger.warning("Skipped migration of %s, %s already exists", path, target)
+            continue
+        os.replace(path, target)
+        count += 1
+
+    logger.info("Migrated %s files in %s", count, storage_dir)
+
+    return count
+
+
+def _match(entry):
+    match = DATA_FILE.fullmatch(entry.name)
+    if match:
+        yield entry.path, match.group("participant"), int(match.group("session")), match.group("kind")
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Migrate a flat dialog storage directory to the sharded layout")
+    parser.add_argument("storage", help="Storage path of the dialog service")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    migrate(args.storage)
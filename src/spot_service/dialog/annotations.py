@@ -0,0 +1,98 @@
+import dataclasses
+import logging
+import queue
+import threading
+import uuid
+from typing import Any, Dict, List, Optional
+
+from cltl.combot.infra.event import Event, EventBus
+from cltl.combot.infra.time_util import timestamp_now
+from emissor.representation.scenario import TextSignal, class_type, Annotation, Mention
+
+from spot_service.dialog.api import SpotterAnnotationEvent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class _AnnotationTask:
+    signals: List[TextSignal]
+    annotations: List[Any]
+    timestamp: int
+    mention: Optional[str]
+    duration: Optional[float]
+
+
+class AnnotationPipeline:
+    """Creates and publishes the annotations of an utterance on a separate thread.
+
+    Submitted annotations are queued in a bounded queue, if it is full the annotations are dropped instead of
+    delaying the dialog. Annotation values that have ``mention`` or ``duration`` fields are enriched with the
+    utterance they were created for and the time it took to handle it.
+    """
+    def __init__(self, event_bus: EventBus, topic: str, source: str, capacity: int = 64):
+        self._event_bus = event_bus
+        self._topic = topic
+        self._source = source
+
+        self._queue = queue.Queue(maxsize=capacity)
+        self._types: Dict[type, str] = {}
+        self._thread = None
+
+        self.dropped = 0
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if not self._thread:
+            return
+
+        self._queue.put(None)
+        self._thread.join()
+        self._thread = None
+
+    def submit(self, signals: List[TextSignal], annotations: List[Any], mention: Optional[str] = None,
+               duration: Optional[float] = None):
+        try:
+            self._queue.put_nowait(_AnnotationTask(signals, annotations, timestamp_now(), mention, duration))
+        except queue.Full:
+            self.dropped += 1
+            logger.warning("Annotation queue full, dropped annotations for %s", mention)
+
+    def _run(self):
+        while True:
+            task = self._queue.get()
+            if task is None:
+                return
+
+            try:
+                self._publish(task)
+            except:
+                logger.exception("Failed to publish annotations %s", task.annotations)
+
+    def _publish(self, task: _AnnotationTask):
+        annotations = [Annotation(type=self._type(val), value=self._enrich(val, task), source=self._source,
+                                  timestamp=task.timestamp)
+                       for val in task.annotations]
+        mention = Mention(uuid.uuid4(), segment=[signal.ruler for signal in task.signals], annotations=annotations)
+        self._event_bus.publish(self._topic, Event.for_payload(SpotterAnnotationEvent.create([mention])))
+
+    def _type(self, val):
+        cls = type(val)
+        if cls not in self._types:
+            self._types[cls] = class_type(val)
+
+        return self._types[cls]
+
+    @staticmethod
+    def _enrich(val, task: _AnnotationTask):
+        if not dataclasses.is_dataclass(val):
+            return val
+
+        fields = {field.name for field in dataclasses.fields(val)}
+        enrichment = {name: value for name, value in (("mention", task.mention), ("duration", task.duration))
+                      if name in fields and value is not None and getattr(val, name) is None}
+
+        return dataclasses.replace(val, **enrichment) if enrichment else val
@@ -0,0 +1,122 @@
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, List, NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _Entry(NamedTuple):
+    sequence: int
+    enqueued: float
+    event: Any
+    coalesce: bool
+    droppable: bool
+
+
+class EventLanes:
+    """Two-lane input queue: priority events are always dequeued before regular events.
+
+    Regular events that are marked as droppable (e.g. text input) are bounded by ``capacity`` (the oldest droppable
+    event is dropped when full), are discarded on dequeue if they waited longer than ``max_age`` seconds and are
+    superseded by a priority event, i.e. discarded when a priority event that was queued after them is dequeued.
+    Other regular events (e.g. mic events) and priority events are always delivered. Consecutive regular events marked
+    as coalescable are returned as a single batch, so that a burst of inputs is handled in one go.
+    """
+    def __init__(self, capacity: int = 16, max_age: Optional[float] = None):
+        self._capacity = capacity
+        self._max_age = max_age
+
+        self._priority = deque()
+        self._regular = deque()
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._closed = False
+
+        self.dropped = 0
+        self.expired = 0
+        self.superseded = 0
+        self.max_wait = 0.0
+
+    def __len__(self):
+        with self._condition:
+            return len(self._priority) + len(self._regular)
+
+    def put(self, event: Any, priority: bool = False, coalesce: bool = False, droppable: bool = False):
+        with self._condition:
+            entry = _Entry(next(self._sequence), time.monotonic(), event, coalesce, droppable)
+            if priority:
+                self._priority.append(entry)
+            else:
+                if droppable and sum(1 for queued in self._regular if queued.droppable) >= self._capacity:
+                    oldest = next(queued for queued in self._regular if queued.droppable)
+                    self._regular.remove(oldest)
+                    self.dropped += 1
+                    logger.warning("Input lane full (%s), dropped event %s", self._capacity, oldest.event)
+                self._regular.append(entry)
+            self._condition.notify()
+
+    def get(self, timeout: Optional[float] = None) -> Optional[List[Any]]:
+        """Wait for the next batch of events.
+
+        Returns ``None`` if the timeout expired without events, or an empty list if the lanes were closed.
+        """
+        deadline = time.monotonic() + timeout if timeout else None
+        with self._condition:
+            while not self._closed:
+                now = time.monotonic()
+                if self._priority:
+                    entry = self._priority.popleft()
+                    self._track_age(now - entry.enqueued)
+                    self._supersede(entry.sequence)
+                    return [entry.event]
+
+                self._expire(now)
+                if self._regular:
+                    return self._next_regular(now)
+
+                remaining = deadline - now if deadline else None
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._condition.wait(remaining)
+
+            return []
+
+    def close(self):
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+
+    def _next_regular(self, now):
+        entry = self._regular.popleft()
+        self._track_age(now - entry.enqueued)
+        batch = [entry.event]
+        while entry.coalesce and self._regular and self._regular[0].coalesce:
+            batch.append(self._regular.popleft().event)
+
+        return batch
+
+    def _expire(self, now):
+        if not self._max_age:
+            return
+
+        self.expired += self._discard(lambda entry: now - entry.enqueued > self._max_age, "expired")
+
+    def _supersede(self, sequence):
+        self.superseded += self._discard(lambda entry: entry.sequence < sequence, "superseded")
+
+    def _discard(self, condition, reason):
+        discarded = [entry for entry in self._regular if entry.droppable and condition(entry)]
+        if discarded:
+            self._regular = deque(entry for entry in self._regular if not (entry.droppable and condition(entry)))
+            for entry in discarded:
+                logger.info("Discarded %s event: %s", reason, entry.event)
+
+        return len(discarded)
+
+    def _track_age(self, age):
+        self.max_wait = max(self.max_wait, age)
+        if age > 1:
+            logger.debug("Event waited %.3fs in queue", age)
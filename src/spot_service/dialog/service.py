@@ -1,20 +1,25 @@
+import functools
 import logging
-import uuid
-from string import punctuation
-from typing import List, Union
-
-from cltl.combot.event.bdi import DesireEvent
-from cltl.combot.event.emissor import TextSignalEvent, AudioSignalStarted, SignalEvent
-from cltl.combot.infra.config import ConfigurationManager
-from cltl.combot.infra.event import Event, EventBus
-from cltl.combot.infra.resource import ResourceManager
-from cltl.combot.infra.time_util import timestamp_now
-from cltl.combot.infra.topic_worker import TopicWorker
-from cltl_service.emissordata.client import EmissorDataClient
-from emissor.representation.scenario import TextSignal, Modality, class_type, Annotation, class_source, Mention
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import List, Union, TYPE_CHECKING
 
 from spot.dialog.dialog_manager import DialogManager, State, ConvState, Input
-from spot_service.dialog.api import GameSignal, GameEvent, SpotterAnnotationEvent
+from spot.dialog.journal import Journal
+from spot.dialog.pool import DialogManagerPool
+from spot_service.dialog.lanes import EventLanes
+from spot_service.dialog.utterance_cache import UtteranceCache, OverflowPolicy
+
+if TYPE_CHECKING:
+    # Only needed for type hints, the combot and emissor modules are imported when the service is used
+    from cltl.combot.event.emissor import TextSignalEvent, AudioSignalStarted, SignalEvent
+    from cltl.combot.infra.config import ConfigurationManager
+    from cltl.combot.infra.event import Event, EventBus
+    from cltl.combot.infra.resource import ResourceManager
+    from cltl_service.emissordata.client import EmissorDataClient
+    from spot_service.dialog.api import GameEvent
 
 logger = logging.getLogger(__name__)
 
@@ -22,34 +27,83 @@ logger = logging.getLogger(__name__)
 CONTENT_TYPE_SEPARATOR = ';'
 
 
+@functools.lru_cache(maxsize=None)
+def _dependencies() -> SimpleNamespace:
+    """The combot and emissor types used to handle events, imported once on first use instead of per turn."""
+    from cltl.combot.event.bdi import DesireEvent
+    from cltl.combot.event.emissor import TextSignalEvent, AudioSignalStarted, SignalEvent
+    from cltl.combot.infra.event import Event
+    from cltl.combot.infra.time_util import timestamp_now
+    from emissor.representation.scenario import TextSignal, Modality, class_type
+    from spot_service.dialog.api import GameSignal, GameEvent
+
+    return SimpleNamespace(DesireEvent=DesireEvent, TextSignalEvent=TextSignalEvent,
+                           AudioSignalStarted=AudioSignalStarted, SignalEvent=SignalEvent, Event=Event,
+                           timestamp_now=timestamp_now, TextSignal=TextSignal, Modality=Modality,
+                           class_type=class_type, GameSignal=GameSignal, GameEvent=GameEvent)
+
+
 class SpotDialogService:
     @classmethod
-    def from_config(cls, manager: DialogManager, emissor_client: EmissorDataClient,
-                    event_bus: EventBus, resource_manager: ResourceManager,
-                    config_manager: ConfigurationManager):
+    def from_config(cls, manager: DialogManager, emissor_client: 'EmissorDataClient',
+                    event_bus: 'EventBus', resource_manager: 'ResourceManager',
+                    config_manager: 'ConfigurationManager', pool: DialogManagerPool = None, namespace: str = None):
         config = config_manager.get_config("spot.dialog")
 
-        mic_topic = config.get("topic_mic") if "topic_mic" in config else None
-        text_input_topic = config.get("topic_text_input")
-        game_input_topic = config.get("topic_game_input")
-        game_state_topic = config.get("topic_game_state")
-        annotation_topic = config.get("topic_annotation")
-        output_topic = config.get("topic_text_output")
+        def topic(name):
+            # Bind the topics of the service to the namespace of a booth
+            return f"{namespace}.{config.get(name)}" if namespace else config.get(name)
+
+        mic_topic = topic("topic_mic") if "topic_mic" in config else None
+        text_input_topic = topic("topic_text_input")
+        game_input_topic = topic("topic_game_input")
+        game_state_topic = topic("topic_game_state")
+        annotation_topic = topic("topic_annotation")
+        output_topic = topic("topic_text_output")
 
-        intention_topic = config.get("topic_intention") if "topic_intention" in config else None
-        desire_topic = config.get("topic_desire") if "topic_desire" in config else None
+        intention_topic = topic("topic_intention") if "topic_intention" in config else None
+        desire_topic = topic("topic_desire") if "topic_desire" in config else None
         intentions = config.get("intentions", multi=True) if "intentions" in config else []
 
         gap_timeout = config.get_int("gap_timeout") / 1000 if "gap_timeout" in config else 0
 
+        cache_fragments = config.get_int("utterance_cache_fragments") if "utterance_cache_fragments" in config else 8
+        cache_length = config.get_int("utterance_cache_length") if "utterance_cache_length" in config else 512
+        cache_policy = OverflowPolicy[config.get("utterance_cache_overflow").upper()] \
+            if "utterance_cache_overflow" in config else OverflowPolicy.DROP_OLDEST
+        utterance_cache = UtteranceCache(cache_fragments, cache_length, cache_policy)
+
+        max_input_age = config.get_int("max_input_age") / 1000 if "max_input_age" in config else None
+        pool_timeout = config.get_int("pool_timeout") / 1000 if "pool_timeout" in config else 10
+
+        # The journal is on by default if the manager has a storage path
+        journal_dir = config.get("journal_dir") if "journal_dir" in config else None
+        if not journal_dir and manager.storage_path:
+            journal_dir = os.path.join(manager.storage_path, "journal")
+        journal = None
+        if journal_dir:
+            os.makedirs(journal_dir, exist_ok=True)
+            journal = Journal(os.path.join(journal_dir, f"{namespace or 'dialog'}_int{manager.interaction}.journal"))
+
         return cls(mic_topic, text_input_topic, game_input_topic, game_state_topic, output_topic, annotation_topic,
-                   intention_topic, desire_topic, intentions, gap_timeout, manager, emissor_client, event_bus, resource_manager)
+                   intention_topic, desire_topic, intentions, gap_timeout, manager, emissor_client, event_bus, resource_manager,
+                   utterance_cache, max_input_age, pool=pool, pool_timeout=pool_timeout, journal=journal)
 
     def __init__(self, mic_topic: str, text_input_topic: str, game_input_topic: str, game_state_topic: str,
                  output_topic: str, annotation_topic: str, intention_topic: str, desire_topic: str, intentions: List[str],
-                 gap_timeout: float, manager: DialogManager, emissor_client: EmissorDataClient,
-                 event_bus: EventBus, resource_manager: ResourceManager):
+                 gap_timeout: float, manager: DialogManager, emissor_client: 'EmissorDataClient',
+                 event_bus: 'EventBus', resource_manager: 'ResourceManager', utterance_cache: UtteranceCache = None,
+                 max_input_age: float = None, buffer_size: int = 16, pool: DialogManagerPool = None,
+                 pool_timeout: float = 10, journal: Journal = None):
+        from emissor.representation.scenario import class_source
+        from spot_service.dialog.annotations import AnnotationPipeline
+
         self._manager = manager
+        self._pool = pool
+        self._pool_timeout = pool_timeout
+        self._journal = journal
+        if journal:
+            manager.journal = journal
 
         self._event_bus = event_bus
         self._resource_manager = resource_manager
@@ -67,26 +121,60 @@ class SpotDialogService:
         self._intentions = intentions
 
         self._topic_worker = None
+        self._annotations = AnnotationPipeline(event_bus, annotation_topic, class_source(self))
+        self._dispatcher = None
+        self._lanes = None
+        self._buffer_size = buffer_size
+        self._max_input_age = max_input_age
 
         self._ignore_utterances = False if mic_topic else None
 
         self._gap_timeout = gap_timeout
-        self._utterance_cache = []
+        self._utterance_cache = utterance_cache if utterance_cache is not None else UtteranceCache()
 
     @property
     def app(self):
         return None
 
+    @property
+    def metrics(self) -> dict:
+        """Counters of the input lanes, the utterance cache and the annotation pipeline."""
+        metrics = {
+            "cache_max_depth": self._utterance_cache.max_depth,
+            "cache_overflows": self._utterance_cache.overflows,
+            "cache_dropped": self._utterance_cache.dropped,
+            "annotations_dropped": self._annotations.dropped,
+        }
+        if self._lanes:
+            metrics.update({
+                "lanes_dropped": self._lanes.dropped,
+                "lanes_expired": self._lanes.expired,
+                "lanes_superseded": self._lanes.superseded,
+                "lanes_max_wait": self._lanes.max_wait,
+            })
+
+        return metrics
+
     def start(self, timeout=30):
         input_topics = [self._text_input_topic, self._game_input_topic]
         if self._mic_topic:
             input_topics += [self._mic_topic]
 
+        # Import the dependencies of the event handling before the first event arrives
+        _dependencies()
+        self._annotations.start()
+        self._lanes = EventLanes(capacity=self._buffer_size, max_age=self._max_input_age)
+        self._dispatcher = threading.Thread(target=self._dispatch, name=self.__class__.__name__ + "-dispatcher",
+                                            daemon=True)
+        self._dispatcher.start()
+
+        from cltl.combot.infra.topic_worker import TopicWorker
+
         self._topic_worker = TopicWorker(input_topics, self._event_bus,
                                          provides=[self._output_topic, self._game_state_topic],
                                          intention_topic=self._intention_topic, intentions=self._intentions,
-                                         resource_manager=self._resource_manager, processor=self._process,
-                                         scheduled= self._gap_timeout, buffer_size=16, name=self.__class__.__name__)
+                                         resource_manager=self._resource_manager, processor=self._enqueue,
+                                         buffer_size=self._buffer_size, name=self.__class__.__name__)
         self._topic_worker.start().wait()
 
     def stop(self):
@@ -97,14 +185,53 @@ class SpotDialogService:
         self._topic_worker.await_stop()
         self._topic_worker = None
 
-    def _process(self, event: Event[Union[TextSignalEvent, AudioSignalStarted, SignalEvent[GameEvent]]]):
+        self._lanes.close()
+        self._dispatcher.join()
+        self._dispatcher = None
+        self._annotations.stop()
+        if self._journal:
+            self._journal.close()
+
+    def resume(self):
+        """Continue a game restored by the DialogManager after a restart, call before the service is started."""
+        response, state, input, annotations, await_continuation = self._manager.run(None, None)
+        self._send_reply(response, state, input)
+
+    def _enqueue(self, event: 'Event[Union[TextSignalEvent, AudioSignalStarted, SignalEvent[GameEvent]]]'):
+        if not event:
+            return
+
+        # Game events take priority, text events and mic events keep their relative order. Only text events can be
+        # dropped, mic events are always delivered as they end ignoring utterances
+        if event.metadata.topic == self._game_input_topic:
+            self._lanes.put(event, priority=True)
+        else:
+            text = event.metadata.topic == self._text_input_topic
+            self._lanes.put(event, coalesce=text, droppable=text)
+
+    def _dispatch(self):
+        while True:
+            events = self._lanes.get(timeout=self._gap_timeout if self._gap_timeout else None)
+            if events == []:
+                logger.debug("Stopped dispatching events")
+                return
+
+            try:
+                if events is None:
+                    self._process(None)
+                elif len(events) > 1:
+                    self._process_utterances(events)
+                else:
+                    self._process(events[0])
+            except Exception:
+                logger.exception("Failed to process events %s", events)
+
+    def _process(self, event: 'Event[Union[TextSignalEvent, AudioSignalStarted, SignalEvent[GameEvent]]]'):
         if not event:
             # Reached wait-timeout for utterance continuation
-            if self._utterance_cache:
-                response, state, input, annotations, await_continuation = self._manager.commit()
-                logger.debug("Responded after timeout (%s): %s", self._utterance_cache, response)
-                self._send_reply(response, state, input)
-            self._utterance_cache = []
+            if self._manager.uncommitted:
+                self._commit_utterance()
+            self._utterance_cache.clear()
             return
 
         if event.metadata.topic == self._game_input_topic:
@@ -112,65 +239,105 @@ class SpotDialogService:
             self._send_reply(response, state, input)
             logger.info("Handled game event %s", event.payload.signal.value)
         elif event.metadata.topic == self._mic_topic:
-            if event.payload.type == AudioSignalStarted.__name__:
-                self._set_ignore_utterances(False)
-        elif event.metadata.topic == self._text_input_topic and not event.payload.signal.text:
-            # Ignore empty inputs
-            pass
-        elif event.metadata.topic == self._text_input_topic and not self._ignore_utterances:
-            # Ignore events until utterance is handled
-            self._set_ignore_utterances()
-            utterance = "" if not self._utterance_cache else " ".join(self._utterance_cache)
-            utterance += " " if utterance else ""
-            utterance += event.payload.signal.text
-            response, state, input, annotations, await_continuation = self._manager.utterance(utterance)
-
-            logger.debug("Result from disambiguation of '%s': %s, %s, %s, %s", utterance, response, state, input, annotations)
-
-            if await_continuation:
-                self._send_reply(None, state, input)
-                text = event.payload.signal.text
-                logger.debug("Cached utterance: %s and response: %s", text, response)
-                self._utterance_cache.append(text.strip(punctuation))
+            if event.payload.type == _dependencies().AudioSignalStarted.__name__:
                 self._set_ignore_utterances(False)
-            else:
-                logger.debug("Resonded: %s", response)
-                self._send_reply(response, state, input)
-                self._utterance_cache = []
+        elif event.metadata.topic == self._text_input_topic:
+            self._process_utterances([event])
+        else:
+            logger.info("Ignored event %s (ignore utterances: %s)", event, self._ignore_utterances)
+
+    def _process_utterances(self, events: List['Event[TextSignalEvent]']):
+        # Ignore empty inputs
+        events = [event for event in events if event.payload.signal.text]
+        if not events:
+            return
 
-            if annotations:
-                self._send_annotations(event.payload.signal, annotations)
+        if self._ignore_utterances:
+            logger.info("Ignored %s text events while handling utterance: %s", len(events),
+                        [event.payload.signal.text for event in events])
+            return
 
-            if not response and input == Input.REPLY:
-                self._set_ignore_utterances(False)
+        # Coalesce a burst of superseded fragments into a single utterance
+        text = " ".join(event.payload.signal.text for event in events)
+        if len(events) > 1:
+            logger.debug("Coalesced %s text events: %s", len(events), text)
+
+        if self._utterance_cache and self._utterance_cache.policy == OverflowPolicy.COMMIT \
+                and self._utterance_cache.overflows_with(text):
+            # Commit the cached utterance and continue with the fragment as a new utterance
+            self._commit_utterance()
+            self._utterance_cache.flush(text)
+
+        # Ignore events until utterance is handled
+        self._set_ignore_utterances()
+        utterance = self._utterance_cache.utterance(text)
+        signals = [event.payload.signal for event in events]
+        utterance_signals = self._utterance_cache.signals + signals
+        start = time.perf_counter()
+        response, state, input, annotations, await_continuation = self._manager.utterance(utterance)
+        duration = time.perf_counter() - start
+
+        logger.debug("Result from disambiguation of '%s': %s, %s, %s, %s", utterance, response, state, input, annotations)
+
+        if await_continuation:
+            self._send_reply(None, state, input)
+            logger.debug("Cached utterance: %s and response: %s", text, response)
+            self._utterance_cache.append(text, signals)
+            self._set_ignore_utterances(False)
         else:
-            logger.info("Ignored event %s (ignore utterances: %s)", event, self._ignore_utterances)
+            logger.debug("Resonded: %s", response)
+            self._send_reply(response, state, input)
+            self._utterance_cache.clear()
+
+        if annotations:
+            self._annotations.submit(utterance_signals, annotations, mention=utterance, duration=duration)
+
+        if not response and input == Input.REPLY:
+            self._set_ignore_utterances(False)
+
+    def _commit_utterance(self):
+        response, state, input, annotations, await_continuation = self._manager.commit()
+        logger.debug("Responded after commit (%s): %s", self._utterance_cache.text, response)
+        self._send_reply(response, state, input)
 
     def _send_reply(self, response: str, state: State, input: Input):
         if not response and not state:
             return
 
+        deps = _dependencies()
         scenario_id = self._emissor_client.get_current_scenario_id()
         if response:
-            signal = TextSignal.for_scenario(scenario_id, timestamp_now(), timestamp_now(), None, response)
-            signal_event = TextSignalEvent.for_agent(signal)
-            self._event_bus.publish(self._output_topic, Event.for_payload(signal_event))
+            timestamp = deps.timestamp_now()
+            signal = deps.TextSignal.for_scenario(scenario_id, timestamp, timestamp, None, response)
+            signal_event = deps.TextSignalEvent.for_agent(signal)
+            self._event_bus.publish(self._output_topic, deps.Event.for_payload(signal_event))
 
         if state:
-            event = GameEvent(participant_id=self._manager._participant_id, round=str(state.round), interaction=self._manager.interaction,
+            event = deps.GameEvent(participant_id=self._manager._participant_id, round=str(state.round), interaction=self._manager.interaction,
                               state=state.conv_state.name, input=input.name)
-            game_signal = GameSignal.for_scenario(scenario_id, timestamp_now(), event)
-            game_signal_event = SignalEvent(class_type(GameSignal), Modality.VIDEO, game_signal)
-            self._event_bus.publish(self._game_state_topic, Event.for_payload(game_signal_event))
-
-            if ConvState.GAME_FINISH == state.conv_state:
-                self._event_bus.publish(self._desire_topic, Event.for_payload(DesireEvent(['quit'])))
-
-    def _send_annotations(self, signal: TextSignal, annotations):
-        annotations = [Annotation(type=class_type(val), value=val, source=class_source(self), timestamp=timestamp_now())
-                       for val in annotations]
-        mention = Mention(uuid.uuid4(), segment=[signal.ruler], annotations=annotations)
-        self._event_bus.publish(self._annotation_topic, Event.for_payload(SpotterAnnotationEvent.create([mention])))
+            game_signal = deps.GameSignal.for_scenario(scenario_id, deps.timestamp_now(), event)
+            game_signal_event = deps.SignalEvent(deps.class_type(deps.GameSignal), deps.Modality.VIDEO, game_signal)
+            self._event_bus.publish(self._game_state_topic, deps.Event.for_payload(game_signal_event))
+
+            if ConvState.GAME_FINISH == state.conv_state and self._pool:
+                self._next_participant()
+            elif ConvState.GAME_FINISH == state.conv_state:
+                self._event_bus.publish(self._desire_topic, deps.Event.for_payload(deps.DesireEvent(['quit'])))
+
+    def _next_participant(self):
+        # Continue with a prepared manager instead of quitting the application
+        finished = self._manager
+        try:
+            self._manager = self._pool.exchange(finished, timeout=self._pool_timeout)
+            # Continue the journal of the session with the next manager
+            finished.journal = None
+            self._manager.journal = self._journal
+        except TimeoutError:
+            logger.warning("No prepared dialog manager available, reset the finished manager")
+            finished.reset()
+        self._utterance_cache.clear()
+        self._set_ignore_utterances(False)
+        logger.info("Finished game for %s, continue with next participant", finished.participant_id)
 
     def _set_ignore_utterances(self, ignore=True):
         if self._ignore_utterances is None:
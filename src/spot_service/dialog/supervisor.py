@@ -0,0 +1,150 @@
+"""Supervisor that runs the dialog service of several booths in worker processes.
+
+The supervisor can be started with the preload and booth functions of the application, e.g.
+
+``python -m spot_service.dialog.supervisor --preload app.booth:preload --run app.booth:run_booth \
+--checkpoints <dir> booth1 booth2``
+"""
+import argparse
+import gc
+import importlib
+import logging
+import multiprocessing
+import os
+import signal
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BoothSupervisor:
+    """Run the dialog service of several booths as separate worker processes.
+
+    The read-only resources shared by all booths (phrases, preferences, disambiguation world, ..) are loaded once by
+    ``preload`` in the supervisor, and are shared with the workers as copy-on-write memory by forking the worker
+    processes after the preload. Each worker runs ``run_booth(booth, shared, checkpoint_path, recover)`` until it
+    exits, which is expected to bind the service to the topic namespace of the booth (see
+    ``SpotDialogService.from_config``), to pass the checkpoint path of the booth to its DialogManager and to block while
+    the service is running. The checkpoint path is ``<checkpoint_dir>/<booth>.json``, or ``None`` without
+    ``checkpoint_dir``. Workers are restarted when they exit, ``recover`` is set if the previous worker of the booth
+    crashed, so that it can restore the session (see ``DialogManager.restore``).
+
+    Forking requires a platform that supports the ``fork`` start method.
+    """
+    def __init__(self, booths: List[str], preload: Callable[[], Any],
+                 run_booth: Callable[[str, Any, Optional[str], bool], None], checkpoint_dir: Optional[str] = None,
+                 restart_delay: float = 1.0, poll_interval: float = 1.0):
+        self._booths = booths
+        self._preload = preload
+        self._run_booth = run_booth
+        self._checkpoint_dir = checkpoint_dir
+        self._restart_delay = restart_delay
+        self._poll_interval = poll_interval
+
+        self._context = multiprocessing.get_context("fork")
+        self._shared = None
+        self._workers: Dict[str, multiprocessing.Process] = {}
+        self._restarts: Dict[str, int] = {booth: 0 for booth in booths}
+        self._running = False
+
+    @property
+    def restarts(self) -> Dict[str, int]:
+        return dict(self._restarts)
+
+    def checkpoint_path(self, booth: str) -> Optional[str]:
+        return os.path.join(self._checkpoint_dir, f"{booth}.json") if self._checkpoint_dir else None
+
+    def start(self):
+        if self._checkpoint_dir:
+            os.makedirs(self._checkpoint_dir, exist_ok=True)
+
+        self._shared = self._preload()
+        # Move the preloaded objects out of the garbage collector's generations, so that collections in the
+        # workers do not touch and copy the shared pages
+        gc.freeze()
+
+        self._running = True
+        for booth in self._booths:
+            self._start_worker(booth, recover=False)
+
+        return self
+
+    def run(self):
+        """Monitor the workers and restart them when they exit, until :meth:`stop` is called."""
+        while self._running:
+            for booth, worker in list(self._workers.items()):
+                worker.join(timeout=0)
+                if worker.is_alive() or not self._running:
+                    continue
+
+                crashed = worker.exitcode != 0
+                if crashed:
+                    logger.error("Worker for booth %s crashed with exit code %s, restart", booth, worker.exitcode)
+                else:
+                    logger.info("Worker for booth %s finished, restart", booth)
+                self._restarts[booth] += 1
+                time.sleep(self._restart_delay)
+                if not self._running:
+                    # Stopped while waiting, e.g. by SIGTERM, don't start a worker that is never stopped
+                    break
+                self._start_worker(booth, recover=crashed)
+
+            time.sleep(self._poll_interval)
+
+    def stop(self, timeout: Optional[float] = 10):
+        self._running = False
+        for worker in self._workers.values():
+            worker.terminate()
+        for booth, worker in self._workers.items():
+            worker.join(timeout)
+            if worker.is_alive():
+                logger.warning("Worker for booth %s did not stop, kill", booth)
+                worker.kill()
+        self._workers = {}
+
+    def _start_worker(self, booth: str, recover: bool):
+        worker = self._context.Process(target=_run_worker,
+                                       args=(self._run_booth, booth, self._shared, self.checkpoint_path(booth), recover),
+                                       name=f"{self.__class__.__name__}-{booth}", daemon=True)
+        worker.start()
+        self._workers[booth] = worker
+        logger.info("Started worker for booth %s (pid %s, recover: %s)", booth, worker.pid, recover)
+
+
+def _run_worker(run_booth: Callable[[str, Any, Optional[str], bool], None], booth: str, shared: Any,
+                checkpoint_path: Optional[str], recover: bool):
+    # Don't inherit the signal handler of the supervisor
+    signal.signal(signal.SIGTERM, signal.SIG_DFL)
+    run_booth(booth, shared, checkpoint_path, recover)
+
+
+def _load(reference: str) -> Callable:
+    module_name, _, function_name = reference.partition(":")
+    if not function_name:
+        raise ValueError(f"Expected <module>:<function>, got {reference}")
+
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Run the dialog service of several booths")
+    parser.add_argument("booths", nargs="+", help="Names of the booths, used as topic namespace")
+    parser.add_argument("--preload", required=True,
+                        help="Function that loads the shared resources, as <module>:<function>")
+    parser.add_argument("--run", required=True,
+                        help="Function that runs the service of a booth, as <module>:<function>")
+    parser.add_argument("--checkpoints", default=None, help="Directory for the checkpoints of the booths")
+    parser.add_argument("--restart-delay", type=float, default=1.0, help="Delay before a worker is restarted in s")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    supervisor = BoothSupervisor(args.booths, _load(args.preload), _load(args.run), checkpoint_dir=args.checkpoints,
+                                 restart_delay=args.restart_delay)
+    signal.signal(signal.SIGTERM, lambda signum, frame: supervisor.stop())
+    supervisor.start()
+    try:
+        supervisor.run()
+    except KeyboardInterrupt:
+        supervisor.stop()
@@ -0,0 +1,145 @@
+import enum
+import logging
+from collections import deque
+from string import punctuation
+from typing import Any, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+
+class OverflowPolicy(enum.Enum):
+    # Commit the pending disambiguation and start a new utterance with the fragment
+    COMMIT = enum.auto()
+    # Keep the cached fragments and cache only the part of the fragment that fits in the maximum length
+    TRUNCATE = enum.auto()
+    # Drop the oldest fragments until the new fragment fits
+    DROP_OLDEST = enum.auto()
+
+
+class UtteranceCache:
+    """Bounded buffer of ASR fragments that continue a pending utterance.
+
+    The joined utterance is maintained incrementally, fragments are only stripped once when they are added. Each
+    fragment can carry the signals it was received in, such that annotations can refer to the complete utterance.
+    """
+    def __init__(self, max_fragments: int = 8, max_length: int = 512,
+                 policy: OverflowPolicy = OverflowPolicy.DROP_OLDEST):
+        if max_fragments < 1 or max_length < 1:
+            raise ValueError(f"Invalid cache bounds: {max_fragments} fragments, {max_length} characters")
+
+        self._max_fragments = max_fragments
+        self._max_length = max_length
+        self._policy = policy
+
+        self._fragments = deque()
+        self._signals = deque()
+        self._text = ""
+
+        self.max_depth = 0
+        self.overflows = 0
+        self.dropped = 0
+
+    @property
+    def policy(self) -> OverflowPolicy:
+        return self._policy
+
+    @property
+    def depth(self) -> int:
+        return len(self._fragments)
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    @property
+    def signals(self) -> List[Any]:
+        """The signals of the cached fragments, oldest first."""
+        return [signal for signals in self._signals for signal in signals]
+
+    def __bool__(self):
+        return bool(self._fragments)
+
+    def __len__(self):
+        return len(self._fragments)
+
+    def overflows_with(self, text: str) -> bool:
+        fragment = text.strip(punctuation)
+        length = len(self._text) + len(fragment) + (1 if self._text else 0)
+
+        return len(self._fragments) >= self._max_fragments or length > self._max_length
+
+    def utterance(self, text: str) -> str:
+        """The utterance to disambiguate for the cached fragments continued by text."""
+        if self._policy == OverflowPolicy.TRUNCATE and self._fragments and self.overflows_with(text):
+            remainder = self._remainder(text.strip(punctuation))
+            return self._text + " " + remainder if remainder else self._text
+
+        utterance = self._text + " " + text if self._text else text
+
+        return utterance[:self._max_length] if self._policy == OverflowPolicy.TRUNCATE else utterance
+
+    def append(self, text: str, signals: Sequence[Any] = ()) -> Optional[str]:
+        """Add a fragment to the cache.
+
+        Returns the fragment as cached, or ``None`` if it was discarded by the overflow policy. Fragments without
+        text are not cached. A single fragment that exceeds the maximum length is cached truncated. Under the
+        TRUNCATE policy the fragment is cut to the part that was used in :meth:`utterance`.
+        """
+        fragment = text.strip(punctuation)
+        if not fragment:
+            return fragment
+
+        if self.overflows_with(text):
+            remainder = self._remainder(fragment) if self._policy == OverflowPolicy.TRUNCATE else ""
+            if self._fragments and not remainder and self._policy != OverflowPolicy.DROP_OLDEST:
+                self.reject(fragment)
+                return None
+
+            self.overflows += 1
+            if self._fragments and remainder:
+                logger.debug("Utterance cache full, truncated fragment to: %s", remainder)
+                fragment = remainder
+            while self._fragments and (len(self._fragments) >= self._max_fragments
+                                       or len(self._text) + len(fragment) + 1 > self._max_length):
+                self._drop_oldest()
+
+        fragment = fragment[:self._max_length]
+        self._fragments.append(fragment)
+        self._signals.append(tuple(signals))
+        self._text = self._text + " " + fragment if self._text else fragment
+        self.max_depth = max(self.max_depth, len(self._fragments))
+        logger.debug("Utterance cache depth %s (max %s, overflows %s)", len(self._fragments), self.max_depth, self.overflows)
+
+        return fragment
+
+    def reject(self, text: str):
+        """Record a fragment that is discarded because the cache is full."""
+        self.overflows += 1
+        self.dropped += 1
+        logger.debug("Utterance cache full (%s fragments, policy %s), dropped: %s",
+                     len(self._fragments), self._policy.name, text)
+
+    def flush(self, text: str):
+        """Record an overflow by text that commits and clears the cached fragments (COMMIT policy)."""
+        self.overflows += 1
+        logger.debug("Utterance cache full (%s fragments), commit before: %s", len(self._fragments), text)
+        self.clear()
+
+    def clear(self):
+        self._fragments.clear()
+        self._signals.clear()
+        self._text = ""
+
+    def _remainder(self, fragment: str) -> str:
+        """The part of the fragment that still fits in the cache."""
+        if len(self._fragments) >= self._max_fragments:
+            return ""
+
+        return fragment[:max(self._max_length - len(self._text) - 1, 0)].strip()
+
+    def _drop_oldest(self):
+        oldest = self._fragments.popleft()
+        self._signals.popleft()
+        self._text = self._text[len(oldest) + 1:] if self._fragments else ""
+        self.dropped += 1
+        logger.debug("Dropped oldest fragment from utterance cache: %s", oldest)
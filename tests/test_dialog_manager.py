@@ -0,0 +1,50 @@
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples"))
+
+from explore_states import StubDisambiguator, PHRASES, PREFERENCES, GameStart
+from spot.dialog.analytics import REPAIR, SKIP
+from spot.dialog.dialog_manager import DialogManager, ConvState, Input
+from spot.dialog.status import DisambiguatorStatus
+
+
+class DialogManagerTest(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self.manager = DialogManager(StubDisambiguator(), PHRASES, PREFERENCES, 1, None, rounds=1, max_position=2,
+                                     questionnaires=[1], disambiguator_positions=2)
+
+    def tearDown(self):
+        logging.disable(logging.NOTSET)
+
+    def query_first_position(self):
+        _, state, awaited, _, _ = self.manager.game_event(GameStart())
+        for _ in range(20):
+            if state.conv_state == ConvState.DISAMBIGUATION:
+                return
+            if awaited == Input.GAME:
+                _, state, awaited, _, _ = self.manager.game_event(GameStart())
+            else:
+                _, state, awaited, _, _ = self.manager.utterance("ja")
+
+        self.fail(f"No disambiguation reached, stopped in {state.conv_state}")
+
+    def test_repairs_until_skip(self):
+        self.query_first_position()
+        self.manager._disambiguator.plan = (DisambiguatorStatus.NO_MATCH.name, False)
+        for _ in range(4):
+            _, state, _, _, _ = self.manager.utterance("de man met de hoed")
+
+        statistics = self.manager.statistics
+        self.assertEqual(ConvState.DISAMBIGUATION, state.conv_state)
+        self.assertEqual(2, state.position)
+        self.assertEqual(3, statistics.count(REPAIR, 1, 1))
+        self.assertEqual(3, statistics.count(f"{REPAIR}_{DisambiguatorStatus.NO_MATCH.name}", 1, 1))
+        self.assertEqual(1, statistics.count(SKIP, 1, 1))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+import threading
+import time
+import unittest
+
+from spot_service.dialog.lanes import EventLanes
+
+
+class EventLanesTest(unittest.TestCase):
+    def test_priority_first(self):
+        lanes = EventLanes()
+        lanes.put("mic")
+        lanes.put("game", priority=True)
+
+        self.assertEqual(["game"], lanes.get(0.1))
+        self.assertEqual(["mic"], lanes.get(0.1))
+
+    def test_coalesce_consecutive_text(self):
+        lanes = EventLanes()
+        lanes.put("t1", coalesce=True, droppable=True)
+        lanes.put("t2", coalesce=True, droppable=True)
+        lanes.put("mic")
+        lanes.put("t3", coalesce=True, droppable=True)
+
+        self.assertEqual(["t1", "t2"], lanes.get(0.1))
+        self.assertEqual(["mic"], lanes.get(0.1))
+        self.assertEqual(["t3"], lanes.get(0.1))
+
+    def test_timeout(self):
+        self.assertIsNone(EventLanes().get(0.01))
+
+    def test_close(self):
+        lanes = EventLanes()
+        threading.Timer(0.05, lanes.close).start()
+
+        self.assertEqual([], lanes.get())
+
+    def test_capacity_drops_oldest_text(self):
+        lanes = EventLanes(capacity=2)
+        lanes.put("mic")
+        for text in ("t1", "t2", "t3"):
+            lanes.put(text, droppable=True)
+
+        self.assertEqual(["mic"], lanes.get(0.1))
+        self.assertEqual(["t2"], lanes.get(0.1))
+        self.assertEqual(["t3"], lanes.get(0.1))
+        self.assertEqual(1, lanes.dropped)
+
+    def test_expire_text_only(self):
+        lanes = EventLanes(max_age=0.01)
+        lanes.put("mic")
+        lanes.put("t1", droppable=True)
+        time.sleep(0.05)
+        lanes.put("t2", droppable=True)
+
+        self.assertEqual(["mic"], lanes.get(0.1))
+        self.assertEqual(["t2"], lanes.get(0.1))
+        self.assertEqual(1, lanes.expired)
+
+    def test_supersede_text_only(self):
+        lanes = EventLanes()
+        lanes.put("mic")
+        lanes.put("t1", coalesce=True, droppable=True)
+        lanes.put("game", priority=True)
+        lanes.put("t2", coalesce=True, droppable=True)
+
+        self.assertEqual(["game"], lanes.get(0.1))
+        self.assertEqual(["mic"], lanes.get(0.1))
+        self.assertEqual(["t2"], lanes.get(0.1))
+        self.assertIsNone(lanes.get(0.01))
+        self.assertEqual(1, lanes.superseded)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import os
+import sys
+import time
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples"))
+
+from explore_states import StubDisambiguator, PHRASES, PREFERENCES
+from spot.dialog.dialog_manager import DialogManager, ConvState, Input
+from spot.dialog.pool import DialogManagerPool
+from spot.dialog.status import DisambiguatorStatus
+
+
+class GameStart:
+    def __init__(self, participant_id):
+        self.participant_id = participant_id
+        self.participant_name = participant_id
+
+
+class ResettableDisambiguator(StubDisambiguator):
+    def __init__(self):
+        super().__init__()
+        self.history = []
+
+    def disambiguate(self, mention, force_commit=False):
+        self.history.append(mention)
+
+        return super().disambiguate(mention, force_commit)
+
+    def reset(self):
+        self.history = []
+        self.advance_round(start=True)
+
+
+class DialogManagerPoolTest(unittest.TestCase):
+    def setUp(self):
+        self.built = []
+        self.pool = None
+
+    def tearDown(self):
+        if self.pool:
+            self.pool.stop()
+
+    def create_manager(self, disambiguator_class):
+        def factory():
+            manager = DialogManager(disambiguator_class(), PHRASES, PREFERENCES, 1, None,
+                                    rounds=1, max_position=2, questionnaires=[1], disambiguator_positions=2)
+            self.built.append(manager)
+            return manager
+
+        return factory
+
+    def play(self, manager, participant_id):
+        _, state, awaited, _, _ = manager.game_event(GameStart(participant_id))
+        for _ in range(20):
+            if state.conv_state == ConvState.DISAMBIGUATION:
+                break
+            if awaited == Input.GAME:
+                _, state, awaited, _, _ = manager.game_event(GameStart(participant_id))
+            else:
+                _, state, awaited, _, _ = manager.utterance("ja")
+        self.assertEqual(ConvState.DISAMBIGUATION, state.conv_state)
+        manager._disambiguator.plan = (DisambiguatorStatus.NO_MATCH.name, False)
+        manager.utterance("de man met de hoed")
+
+    def await_available(self):
+        deadline = time.monotonic() + 5
+        while not self.pool.available and time.monotonic() < deadline:
+            time.sleep(0.01)
+
+    def test_exchange_resets_disambiguator(self):
+        factory = self.create_manager(ResettableDisambiguator)
+        self.pool = DialogManagerPool(factory).start()
+        first = factory()
+        self.play(first, "p1")
+        self.assertTrue(first._disambiguator.history)
+
+        second = self.pool.exchange(first, timeout=5)
+        self.assertIsNot(first, second)
+        self.play(second, "p2")
+        self.await_available()
+        reused = self.pool.exchange(second, timeout=5)
+
+        self.assertIs(first, reused)
+        self.assertEqual(2, len(self.built))
+        self.assertEqual(ConvState.GAME_INIT, reused._state.conv_state)
+        self.assertIsNone(reused.participant_id)
+        self.assertEqual([], reused._disambiguator.history)
+        self.assertEqual(DisambiguatorStatus.AWAIT_NEXT.name, reused._disambiguator.status())
+
+        reused.game_event(GameStart("p3"))
+        self.assertEqual("p3", reused.participant_id)
+        self.assertEqual(ConvState.GAME_START, reused._state.conv_state)
+
+    def test_exchange_rebuilds_without_reset(self):
+        factory = self.create_manager(StubDisambiguator)
+        self.pool = DialogManagerPool(factory).start()
+        first = factory()
+        self.play(first, "p1")
+
+        self.pool.exchange(first, timeout=5)
+        self.await_available()
+        replacement = self.pool.exchange(factory(), timeout=5)
+
+        self.assertIsNot(first, replacement)
+        self.assertFalse(first.resettable)
+        self.assertEqual(4, len(self.built))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,28 @@
+import logging
+import os
+import sys
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "examples"))
+
+from explore_states import explore, cannot_finish
+
+
+class StateSpaceTest(unittest.TestCase):
+    """Bounded exploration of the DialogManager state space, run ``examples/explore_states.py`` for larger bounds."""
+    def test_all_states_can_finish(self):
+        logging.disable(logging.WARNING)
+        try:
+            seen, edges, transitions, errors, stuck, truncated = explore(rounds=1, positions=2, max_states=20000,
+                                                                         workers=1)
+        finally:
+            logging.disable(logging.NOTSET)
+
+        self.assertFalse(truncated)
+        self.assertEqual({}, dict(errors))
+        self.assertEqual({}, dict(stuck))
+        self.assertEqual(set(), cannot_finish(seen, edges))
+
+
+if __name__ == '__main__':
+    unittest.main()
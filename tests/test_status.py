@@ -0,0 +1,59 @@
+import importlib.util
+import inspect
+import unittest
+
+from spot.dialog.status import DisambiguatorStatus, DisambiguationOutcome
+
+
+class StubDisambiguator:
+    def __init__(self, status):
+        self._status = status
+
+    def disambiguate(self, mention, force_commit=False):
+        return 1, 0.8, 2, "de man", False
+
+    def status(self, uncommitted=False):
+        return self._status
+
+
+class DisambiguatorStatusTest(unittest.TestCase):
+    @unittest.skipIf(importlib.util.find_spec("spot.pragmatic_model") is None, "spot.pragmatic_model is not installed")
+    def test_mirror_matches_pragmatic_model(self):
+        from spot.pragmatic_model.model_ambiguity import DisambiguatorStatus as ModelStatus
+
+        self.assertEqual({status.name for status in ModelStatus}, set(DisambiguatorStatus.__members__))
+
+    @unittest.skipIf(importlib.util.find_spec("spot.pragmatic_model") is None, "spot.pragmatic_model is not installed")
+    def test_dialog_manager_calls_match_pragmatic_model(self):
+        from spot.pragmatic_model.model_ambiguity import Disambiguator
+
+        # The calls of the DialogManager on its disambiguator, positions are passed as disambiguator_positions
+        calls = {
+            "disambiguate": (("mention",), {"force_commit": False}),
+            "status": ((), {"uncommitted": True}),
+            "commit_status": ((), {}),
+            "advance_round": ((), {"start": True}),
+            "advance_position": ((), {"skip": True}),
+            "save_interaction": (("storage", "participant", 1), {}),
+            "load_interaction": (("storage", "participant", "1"), {}),
+        }
+        for name, (args, kwargs) in calls.items():
+            with self.subTest(method=name):
+                self.assertTrue(callable(getattr(Disambiguator, name, None)))
+                inspect.signature(getattr(Disambiguator, name)).bind(None, *args, **kwargs)
+
+    def test_disambiguate(self):
+        outcome = DisambiguationOutcome.disambiguate(StubDisambiguator("SUCCESS_HIGH"), "de man")
+
+        self.assertEqual(DisambiguatorStatus.SUCCESS_HIGH, outcome.status)
+        self.assertEqual(2, outcome.position)
+        self.assertFalse(outcome.await_continuation)
+
+    def test_unknown_status_is_no_match(self):
+        outcome = DisambiguationOutcome.disambiguate(StubDisambiguator("SOMETHING_NEW"), "de man")
+
+        self.assertEqual(DisambiguatorStatus.NO_MATCH, outcome.status)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,68 @@
+import logging
+import os
+import tempfile
+import unittest
+from pathlib import Path
+
+from spot.dialog import storage
+
+
+class StorageTest(unittest.TestCase):
+    def setUp(self):
+        logging.disable(logging.WARNING)
+        self._tmp = tempfile.TemporaryDirectory()
+        self.storage_path = self._tmp.name
+        Path(self.storage_path, storage.DIALOG_DIR).mkdir()
+
+    def tearDown(self):
+        self._tmp.cleanup()
+        logging.disable(logging.NOTSET)
+
+    def write_legacy(self, participant_id, session, kind):
+        path = storage.legacy_path(self.storage_path, participant_id, session, kind)
+        Path(path).write_text("{}")
+
+        return path
+
+    def test_resolve_falls_back_to_flat_layout(self):
+        legacy = self.write_legacy("p1", 1, "preferences")
+
+        self.assertEqual(legacy, storage.resolve_path(self.storage_path, "p1", 1, "preferences"))
+
+        sharded = storage.data_path(self.storage_path, "p1", 1, "preferences", create=True)
+        Path(sharded).write_text("{}")
+        self.assertEqual(sharded, storage.resolve_path(self.storage_path, "p1", 1, "preferences"))
+
+    def test_resolve_missing_file_in_sharded_layout(self):
+        self.assertEqual(storage.data_path(self.storage_path, "p1", 1, "statistics"),
+                         storage.resolve_path(self.storage_path, "p1", 1, "statistics"))
+
+    def test_migrate_known_kinds(self):
+        self.write_legacy("p1", 1, "preferences")
+        self.write_legacy("p1", 1, "statistics")
+        other = self.write_legacy("p1", 1, "notes")
+        unrelated = os.path.join(self.storage_path, storage.DIALOG_DIR, "readme.txt")
+        Path(unrelated).write_text("")
+
+        self.assertEqual(2, storage.migrate(self.storage_path))
+
+        for kind in storage.KINDS:
+            self.assertTrue(os.path.exists(storage.data_path(self.storage_path, "p1", 1, kind)))
+            self.assertFalse(os.path.exists(storage.legacy_path(self.storage_path, "p1", 1, kind)))
+            self.assertEqual(storage.data_path(self.storage_path, "p1", 1, kind),
+                             storage.resolve_path(self.storage_path, "p1", 1, kind))
+        self.assertTrue(os.path.exists(other))
+        self.assertTrue(os.path.exists(unrelated))
+
+    def test_migrate_keeps_existing_target(self):
+        legacy = self.write_legacy("p1", 1, "preferences")
+        target = storage.data_path(self.storage_path, "p1", 1, "preferences", create=True)
+        Path(target).write_text('{"new": true}')
+
+        self.assertEqual(0, storage.migrate(self.storage_path))
+        self.assertTrue(os.path.exists(legacy))
+        self.assertEqual('{"new": true}', Path(target).read_text())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,37 @@
+import sys
+import threading
+import time
+import unittest
+
+from spot_service.dialog.supervisor import BoothSupervisor
+
+
+def preload():
+    return {}
+
+
+def exit_booth(booth, shared, checkpoint_path, recover):
+    sys.exit(0)
+
+
+@unittest.skipIf(sys.platform == "win32", "BoothSupervisor requires the fork start method")
+class BoothSupervisorTest(unittest.TestCase):
+    def test_no_restart_after_stop_during_restart_delay(self):
+        supervisor = BoothSupervisor(["booth1"], preload, exit_booth, restart_delay=0.5, poll_interval=0.01).start()
+        monitor = threading.Thread(target=supervisor.run)
+        monitor.start()
+
+        deadline = time.monotonic() + 5
+        while not supervisor.restarts["booth1"] and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(1, supervisor.restarts["booth1"])
+
+        supervisor.stop()
+        monitor.join(5)
+
+        self.assertFalse(monitor.is_alive())
+        self.assertEqual({}, supervisor._workers)
+
+
+if __name__ == '__main__':
+    unittest.main()
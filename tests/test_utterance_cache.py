@@ -0,0 +1,109 @@
+import unittest
+
+from spot_service.dialog.utterance_cache import UtteranceCache, OverflowPolicy
+
+
+class UtteranceCacheTest(unittest.TestCase):
+    def test_append(self):
+        cache = UtteranceCache()
+
+        self.assertFalse(cache)
+        self.assertEqual("de man", cache.append("de man,"))
+        self.assertEqual("met de hoed", cache.append("met de hoed."))
+        self.assertEqual("de man met de hoed", cache.text)
+        self.assertEqual("de man met de hoed rood", cache.utterance("rood"))
+        self.assertEqual(2, cache.depth)
+
+    def test_append_skips_empty_fragments(self):
+        cache = UtteranceCache(max_fragments=2)
+
+        self.assertEqual("", cache.append("..."))
+        self.assertFalse(cache)
+        cache.append("hallo")
+        cache.append("daar")
+        cache.append("jij")
+
+        self.assertEqual("daar jij", cache.text)
+
+    def test_drop_oldest(self):
+        cache = UtteranceCache(max_fragments=2, policy=OverflowPolicy.DROP_OLDEST)
+
+        cache.append("een")
+        cache.append("twee")
+        self.assertEqual("drie", cache.append("drie"))
+
+        self.assertEqual("twee drie", cache.text)
+        self.assertEqual(1, cache.overflows)
+        self.assertEqual(1, cache.dropped)
+
+    def test_drop_oldest_by_length(self):
+        cache = UtteranceCache(max_length=10, policy=OverflowPolicy.DROP_OLDEST)
+
+        cache.append("hallo")
+        cache.append("daar")
+        cache.append("jij")
+
+        self.assertEqual("daar jij", cache.text)
+        self.assertEqual(1, cache.dropped)
+
+    def test_signals(self):
+        cache = UtteranceCache(max_fragments=2)
+
+        cache.append("een", ["s1"])
+        cache.append("...", ["s2"])
+        cache.append("twee", ["s3", "s4"])
+        cache.append("drie", ["s5"])
+
+        self.assertEqual("twee drie", cache.text)
+        self.assertEqual(["s3", "s4", "s5"], cache.signals)
+
+        cache.clear()
+        self.assertEqual([], cache.signals)
+
+    def test_truncate(self):
+        cache = UtteranceCache(max_fragments=2, max_length=10, policy=OverflowPolicy.TRUNCATE)
+
+        cache.append("hallo")
+        self.assertEqual("hallo daar", cache.utterance("daar jij"))
+        self.assertEqual("daar", cache.append("daar jij"))
+        self.assertEqual("hallo daar", cache.text)
+
+        self.assertEqual("hallo daar", cache.utterance("jij"))
+        self.assertIsNone(cache.append("jij"))
+        self.assertEqual("hallo daar", cache.text)
+
+        self.assertEqual(2, cache.overflows)
+        self.assertEqual(1, cache.dropped)
+
+    def test_truncate_full_length(self):
+        cache = UtteranceCache(max_length=5, policy=OverflowPolicy.TRUNCATE)
+
+        cache.append("hallo")
+        self.assertEqual("hallo", cache.utterance("daar"))
+        self.assertIsNone(cache.append("daar"))
+        self.assertEqual("hallo", cache.text)
+
+    def test_commit(self):
+        cache = UtteranceCache(max_fragments=1, policy=OverflowPolicy.COMMIT)
+
+        cache.append("hallo")
+        self.assertTrue(cache.overflows_with("daar"))
+        cache.flush("daar")
+
+        self.assertFalse(cache)
+        self.assertEqual(1, cache.overflows)
+        self.assertEqual(0, cache.dropped)
+        self.assertEqual("daar", cache.append("daar"))
+
+    def test_long_fragment_in_empty_cache_is_truncated(self):
+        for policy in OverflowPolicy:
+            with self.subTest(policy=policy):
+                cache = UtteranceCache(max_length=5, policy=policy)
+
+                self.assertEqual("hallo", cache.append("hallodaar"))
+                self.assertEqual("hallo", cache.text)
+                self.assertTrue(cache)
+
+
+if __name__ == '__main__':
+    unittest.main()